@@ -4,8 +4,9 @@ Actions API routes - operational actions
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
-from services.auth import AuthService
+from services.auth import auth_service
 from services.executor import OperationExecutor
+from services.worker_pools import WorkerPools
 
 router = APIRouter(prefix="/actions", tags=["Actions"])
 security = HTTPBearer()
@@ -14,7 +15,6 @@ security = HTTPBearer()
 def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
     """Dependency to get current authenticated user"""
     token = credentials.credentials
-    auth_service = AuthService()
     username = auth_service.verify_token(token)
 
     if not username:
@@ -31,7 +31,7 @@ def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(securit
 async def restart_gateway(current_user: str = Depends(get_current_user)):
     """Restart Gateway"""
     executor = OperationExecutor()
-    result = executor.restart_gateway()
+    result = await WorkerPools.run("subprocess", executor.restart_gateway)
 
     if not result.success:
         raise HTTPException(status_code=400, detail=result.message)
@@ -43,7 +43,7 @@ async def restart_gateway(current_user: str = Depends(get_current_user)):
 async def stop_gateway(current_user: str = Depends(get_current_user)):
     """Stop Gateway"""
     executor = OperationExecutor()
-    result = executor.stop_gateway()
+    result = await WorkerPools.run("subprocess", executor.stop_gateway)
 
     if not result.success:
         raise HTTPException(status_code=400, detail=result.message)
@@ -55,7 +55,7 @@ async def stop_gateway(current_user: str = Depends(get_current_user)):
 async def start_gateway(current_user: str = Depends(get_current_user)):
     """Start Gateway"""
     executor = OperationExecutor()
-    result = executor.start_gateway()
+    result = await WorkerPools.run("subprocess", executor.start_gateway)
 
     if not result.success:
         raise HTTPException(status_code=400, detail=result.message)
@@ -67,7 +67,7 @@ async def start_gateway(current_user: str = Depends(get_current_user)):
 async def create_backup(current_user: str = Depends(get_current_user)):
     """Create a backup"""
     executor = OperationExecutor()
-    result = executor.create_backup()
+    result = await WorkerPools.run("file_io", executor.create_backup)
 
     if not result.success:
         raise HTTPException(status_code=400, detail=result.message)
@@ -79,7 +79,7 @@ async def create_backup(current_user: str = Depends(get_current_user)):
 async def list_backups(current_user: str = Depends(get_current_user)):
     """List available backups"""
     executor = OperationExecutor()
-    result = executor.list_backups()
+    result = await WorkerPools.run("file_io", executor.list_backups)
 
     if not result.success:
         raise HTTPException(status_code=400, detail=result.message)
@@ -91,7 +91,7 @@ async def list_backups(current_user: str = Depends(get_current_user)):
 async def clear_logs(current_user: str = Depends(get_current_user)):
     """Clear log files"""
     executor = OperationExecutor()
-    result = executor.clear_logs()
+    result = await WorkerPools.run("file_io", executor.clear_logs)
 
     if not result.success:
         raise HTTPException(status_code=400, detail=result.message)
@@ -103,7 +103,7 @@ async def clear_logs(current_user: str = Depends(get_current_user)):
 async def send_test_message(current_user: str = Depends(get_current_user)):
     """Send a test message through Gateway"""
     executor = OperationExecutor()
-    result = executor.send_message("Test message from OpenClaw Dashboard")
+    result = await WorkerPools.run("subprocess", executor.send_message, "Test message from OpenClaw Dashboard")
 
     if not result.success:
         raise HTTPException(status_code=400, detail=result.message)
@@ -1,11 +1,15 @@
 """
 Agents API routes - agent status and configuration
 """
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
-from services.auth import AuthService
+from services.auth import auth_service
 from services.collector import StatusCollector
+from services.subagent_index import SubagentRunIndex
+from services.worker_pools import WorkerPools
 
 router = APIRouter(prefix="/agents", tags=["Agents"])
 security = HTTPBearer()
@@ -14,7 +18,6 @@ security = HTTPBearer()
 def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
     """Dependency to get current authenticated user"""
     token = credentials.credentials
-    auth_service = AuthService()
     username = auth_service.verify_token(token)
 
     if not username:
@@ -31,21 +34,21 @@ def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(securit
 async def get_agent_status(current_user: str = Depends(get_current_user)):
     """Get complete agent status"""
     collector = StatusCollector()
-    return collector.get_agent_status()
+    return await WorkerPools.run("file_io", collector.get_agent_status)
 
 
 @router.get("/main")
 async def get_main_agent_config(current_user: str = Depends(get_current_user)):
     """Get main agent configuration"""
     collector = StatusCollector()
-    return collector.get_agent_config()
+    return await WorkerPools.run("file_io", collector.get_agent_config)
 
 
 @router.get("/models")
 async def get_available_models(current_user: str = Depends(get_current_user)):
     """Get available models from configuration"""
     collector = StatusCollector()
-    config = collector.get_agent_config()
+    config = await WorkerPools.run("file_io", collector.get_agent_config)
     return {
         "provider": config.provider,
         "model": config.model,
@@ -58,7 +61,11 @@ async def get_available_models(current_user: str = Depends(get_current_user)):
 
 
 @router.get("/subagents")
-async def get_subagent_runs(current_user: str = Depends(get_current_user)):
-    """Get subagent run history"""
-    collector = StatusCollector()
-    return collector.get_subagent_runs()
+async def get_subagent_runs(
+    offset: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=500),
+    status: Optional[str] = None,
+    current_user: str = Depends(get_current_user)
+):
+    """Page through subagent run history, newest first, optionally for one status"""
+    return await WorkerPools.run("file_io", SubagentRunIndex.page, offset=offset, limit=limit, status=status)
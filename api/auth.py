@@ -5,7 +5,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
 from models import UserLogin, TokenResponse, UserResponse, PasswordChange
-from services.auth import AuthService
+from services.auth import auth_service
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 security = HTTPBearer()
@@ -14,7 +14,6 @@ security = HTTPBearer()
 def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
     """Dependency to get current authenticated user"""
     token = credentials.credentials
-    auth_service = AuthService()
     username = auth_service.verify_token(token)
 
     if not username:
@@ -30,8 +29,6 @@ def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(securit
 @router.post("/login", response_model=TokenResponse)
 async def login(credentials: UserLogin):
     """Login and get access token"""
-    auth_service = AuthService()
-
     user = auth_service.authenticate(credentials.username, credentials.password)
 
     if not user:
@@ -54,8 +51,6 @@ async def login(credentials: UserLogin):
 @router.post("/change-password", response_model=dict)
 async def change_password(data: PasswordChange, current_user: str = Depends(get_current_user)):
     """Change password"""
-    auth_service = AuthService()
-
     success = auth_service.change_password(
         current_user,
         data.old_password,
@@ -74,7 +69,6 @@ async def change_password(data: PasswordChange, current_user: str = Depends(get_
 @router.get("/me", response_model=UserResponse)
 async def get_me(current_user: str = Depends(get_current_user)):
     """Get current user info"""
-    auth_service = AuthService()
     users = auth_service.list_users()
 
     for user in users:
@@ -93,5 +87,4 @@ async def get_me(current_user: str = Depends(get_current_user)):
 @router.get("/users", response_model=list)
 async def list_users(current_user: str = Depends(get_current_user)):
     """List all users (admin only)"""
-    auth_service = AuthService()
     return auth_service.list_users()
@@ -4,7 +4,7 @@ Channels API routes - channel status and configuration
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
-from services.auth import AuthService
+from services.auth import auth_service
 from services.collector import StatusCollector
 
 router = APIRouter(prefix="/channels", tags=["Channels"])
@@ -14,7 +14,6 @@ security = HTTPBearer()
 def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
     """Dependency to get current authenticated user"""
     token = credentials.credentials
-    auth_service = AuthService()
     username = auth_service.verify_token(token)
 
     if not username:
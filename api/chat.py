@@ -1,26 +1,34 @@
 """
 Chat API - WebSocket and REST chat with persistent storage
 """
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends, HTTPException
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from typing import Dict, List
+from typing import Dict, List, Optional
 import json
 import asyncio
+from contextlib import aclosing
 from datetime import datetime
 import uuid
 
-from database import get_db, ChatMessage, UserSettings
-from services.auth import AuthService
+from config import CHAT_HISTORY_BATCH, CHAT_HISTORY_MAX_PAGE
+from database import get_db, UserSettings
+from services.auth import auth_service
 from services.chat_service import chat_service
+from services.chat_store import ChatStore
+from services.gateway_client import gateway_client
+from services.worker_pools import WorkerPools
 
 router = APIRouter()
 
+# Appended to a reply the gateway stopped sending part-way through
+PARTIAL_REPLY_NOTE = "\n\n⚠️ 回复不完整：与 OpenClaw 的连接中断"
+
 # Store active WebSocket connections
 active_chats: Dict[str, WebSocket] = {}
 
 
 @router.websocket("/chat")
-async def chat_websocket(websocket: WebSocket, db: Session = Depends(get_db)):
+async def chat_websocket(websocket: WebSocket):
     """
     WebSocket endpoint for real-time chat with persistent storage.
     """
@@ -28,7 +36,6 @@ async def chat_websocket(websocket: WebSocket, db: Session = Depends(get_db)):
     
     # Get token from query params
     token = websocket.query_params.get("token")
-    auth_service = AuthService()
     
     if not token:
         await websocket.send_json({
@@ -39,13 +46,8 @@ async def chat_websocket(websocket: WebSocket, db: Session = Depends(get_db)):
         return
     
     # Verify token and get user
-    try:
-        payload = auth_service.verify_token(token)
-        user_id = payload.get("sub")
-        if not user_id:
-            raise ValueError("Invalid token")
-        user_id = int(user_id)
-    except Exception as e:
+    user_id = auth_service.verify_token(token)
+    if not user_id:
         await websocket.send_json({
             "type": "error",
             "content": "Invalid token"
@@ -56,6 +58,7 @@ async def chat_websocket(websocket: WebSocket, db: Session = Depends(get_db)):
     # Generate session ID
     session_id = str(uuid.uuid4())
     active_chats[session_id] = websocket
+    reply_task: Optional[asyncio.Task] = None
     
     try:
         # Send welcome message
@@ -65,18 +68,8 @@ async def chat_websocket(websocket: WebSocket, db: Session = Depends(get_db)):
             "timestamp": datetime.utcnow().isoformat()
         })
         
-        # Send chat history
-        history = db.query(ChatMessage).filter(
-            ChatMessage.user_id == user_id
-        ).order_by(ChatMessage.created_at.asc()).limit(50).all()
-        
-        for msg in history:
-            await websocket.send_json({
-                "type": "history",
-                "role": msg.role,
-                "content": msg.content,
-                "timestamp": msg.created_at.isoformat()
-            })
+        # Send the newest chat history as one frame
+        await send_history_batch(websocket, user_id, CHAT_HISTORY_BATCH)
         
         while True:
             # Receive message from client
@@ -87,44 +80,36 @@ async def chat_websocket(websocket: WebSocket, db: Session = Depends(get_db)):
                 user_content = message.get("content", "").strip()
                 if not user_content:
                     continue
+                if reply_task and not reply_task.done():
+                    await websocket.send_json({
+                        "type": "error",
+                        "content": "上一条回复尚未完成，请稍候或先取消"
+                    })
+                    continue
                 
                 # Save user message to database
-                db_message = ChatMessage(
-                    user_id=user_id,
-                    role="user",
-                    content=user_content,
-                    session_id=session_id
-                )
-                db.add(db_message)
-                db.commit()
-                
-                # Send typing indicator
-                await websocket.send_json({
-                    "type": "typing",
-                    "content": "thinking...",
-                    "timestamp": datetime.utcnow().isoformat()
-                })
-                
-                # Generate response
-                response = await generate_openclaw_response(user_content, user_id, db)
+                await WorkerPools.run("db", ChatStore.add_message, user_id, "user", user_content, session_id)
                 
-                # Save assistant response to database
-                assistant_message = ChatMessage(
-                    user_id=user_id,
-                    role="assistant",
-                    content=response,
-                    session_id=session_id
+                # Reply in the background so a cancel can arrive while it streams
+                reply_task = asyncio.create_task(
+                    stream_reply(websocket, user_content, user_id, session_id)
                 )
-                db.add(assistant_message)
-                db.commit()
-                
-                # Send response
-                await websocket.send_json({
-                    "type": "message",
-                    "role": "assistant",
-                    "content": response,
-                    "timestamp": datetime.utcnow().isoformat()
-                })
+            
+            elif message.get("type") == "cancel":
+                if reply_task and not reply_task.done():
+                    reply_task.cancel()
+            
+            elif message.get("type") == "load_older":
+                try:
+                    before = int(message["before"])
+                    limit = min(max(int(message.get("limit", CHAT_HISTORY_BATCH)), 1), CHAT_HISTORY_MAX_PAGE)
+                except (KeyError, TypeError, ValueError):
+                    await websocket.send_json({
+                        "type": "error",
+                        "content": "无效的历史分页参数"
+                    })
+                    continue
+                await send_history_batch(websocket, user_id, limit, before)
                 
     except WebSocketDisconnect:
         pass
@@ -138,6 +123,12 @@ async def chat_websocket(websocket: WebSocket, db: Session = Depends(get_db)):
         except:
             pass
     finally:
+        if reply_task and not reply_task.done():
+            reply_task.cancel()
+            try:
+                await reply_task
+            except BaseException:
+                pass
         if session_id in active_chats:
             del active_chats[session_id]
         try:
@@ -146,68 +137,120 @@ async def chat_websocket(websocket: WebSocket, db: Session = Depends(get_db)):
             pass
 
 
-async def generate_openclaw_response(user_message: str, user_id: int, db: Session) -> str:
-    """Generate response from OpenClaw Agent using chat service."""
-    # Get conversation history for context
-    history = db.query(ChatMessage).filter(
-        ChatMessage.user_id == user_id
-    ).order_by(ChatMessage.created_at.desc()).limit(10).all()
-    
-    conversation_history = [
-        {"role": msg.role, "content": msg.content}
-        for msg in reversed(history)
-    ]
+async def send_history_batch(websocket: WebSocket, user_id: str, limit: int, before: Optional[int] = None):
+    """Send one page of history (oldest first) in a single compact ``history_batch`` frame."""
+    page = await WorkerPools.run("db", ChatStore.page, user_id, limit, before)
+    await websocket.send_text(json.dumps({
+        "type": "history_batch",
+        "before": before,
+        "messages": page["messages"],
+        "has_more": page["has_more"],
+        "next_before": page["next_before"]
+    }, ensure_ascii=False, separators=(",", ":")))
+
+
+async def stream_reply(websocket: WebSocket, user_content: str, user_id: str, session_id: str):
+    """Relay the reply as ``delta`` frames, then store it and send the complete ``message``."""
+    reply_id = str(uuid.uuid4())
+    parts: List[str] = []
+    cancelled = False
+    error: Optional[Exception] = None
     
-    # Use chat service to generate response
-    return await chat_service.generate_response(user_message, conversation_history)
+    try:
+        # Send typing indicator
+        await websocket.send_json({
+            "type": "typing",
+            "id": reply_id,
+            "content": "thinking...",
+            "timestamp": datetime.utcnow().isoformat()
+        })
+        
+        history = await WorkerPools.run("db", ChatStore.conversation_history, user_id, 10)
+        async with aclosing(chat_service.stream_response(user_content, history)) as chunks:
+            async for chunk in chunks:
+                parts.append(chunk)
+                await websocket.send_json({
+                    "type": "delta",
+                    "id": reply_id,
+                    "content": chunk
+                })
+    except asyncio.CancelledError:
+        cancelled = True
+    except Exception as e:
+        error = e
+        print(f"Chat reply error: {e}")
+    finally:
+        # Save assistant response to database once, with whatever was produced
+        partial = error is not None
+        response = "".join(parts)
+        if response and partial:
+            response += PARTIAL_REPLY_NOTE
+        if response:
+            try:
+                # Shielded: the socket handler may cancel this task again while it closes
+                await asyncio.shield(
+                    WorkerPools.run("db", ChatStore.add_message, user_id, "assistant", response, session_id)
+                )
+            except Exception as e:
+                print(f"Failed to save chat reply: {e}")
+        
+        # Send response
+        try:
+            if error is not None:
+                await websocket.send_json({
+                    "type": "error",
+                    "id": reply_id,
+                    "content": f"回复中断: {error}"
+                })
+            await websocket.send_json({
+                "type": "message",
+                "id": reply_id,
+                "role": "assistant",
+                "content": response,
+                "cancelled": cancelled,
+                "partial": partial,
+                "timestamp": datetime.utcnow().isoformat()
+            })
+        except Exception:
+            pass  # socket already gone; the reply is stored
 
 
 # REST API endpoints
 @router.get("/chat/history")
 async def get_chat_history(
-    limit: int = 50,
-    db: Session = Depends(get_db),
-    current_user: dict = Depends(AuthService().get_current_user)
+    limit: int = Query(50, ge=1, le=200),
+    before: Optional[int] = Query(None, description="Return messages older than this message id"),
+    current_user: dict = Depends(auth_service.get_current_user)
 ):
-    """Get chat history for the current user"""
+    """Get chat history for the current user, newest page first"""
     user_id = current_user.get("id")
     
-    messages = db.query(ChatMessage).filter(
-        ChatMessage.user_id == user_id
-    ).order_by(ChatMessage.created_at.desc()).limit(limit).all()
-    
-    return {
-        "messages": [
-            {
-                "id": msg.id,
-                "role": msg.role,
-                "content": msg.content,
-                "timestamp": msg.created_at.isoformat()
-            }
-            for msg in reversed(messages)
-        ]
-    }
+    return await WorkerPools.run("db", ChatStore.page, user_id, limit, before)
 
 
 @router.delete("/chat/history")
 async def clear_chat_history(
-    db: Session = Depends(get_db),
-    current_user: dict = Depends(AuthService().get_current_user)
+    current_user: dict = Depends(auth_service.get_current_user)
 ):
     """Clear chat history for the current user"""
     user_id = current_user.get("id")
     
-    db.query(ChatMessage).filter(ChatMessage.user_id == user_id).delete()
-    db.commit()
+    await WorkerPools.run("db", ChatStore.clear, user_id)
     
     return {"message": "Chat history cleared"}
 
 
+@router.get("/chat/gateway")
+async def get_gateway_stats(current_user: dict = Depends(auth_service.get_current_user)):
+    """Get gateway connection pool health"""
+    return gateway_client.stats()
+
+
 # User settings endpoints
 @router.get("/settings")
 async def get_user_settings(
     db: Session = Depends(get_db),
-    current_user: dict = Depends(AuthService().get_current_user)
+    current_user: dict = Depends(auth_service.get_current_user)
 ):
     """Get user settings"""
     user_id = current_user.get("id")
@@ -233,7 +276,7 @@ async def update_user_settings(
     language: str = None,
     bg_image: str = None,
     db: Session = Depends(get_db),
-    current_user: dict = Depends(AuthService().get_current_user)
+    current_user: dict = Depends(auth_service.get_current_user)
 ):
     """Update user settings"""
     user_id = current_user.get("id")
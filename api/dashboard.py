@@ -1,11 +1,14 @@
 """
 Dashboard API route - aggregated payload for first paint.
 """
+from typing import Optional
+
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
-from services.auth import AuthService
-from services.collector import StatusCollector
+from services.auth import auth_service
+from services.collector import StatusCollector, parse_sections
+from services.worker_pools import WorkerPools
 
 router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
 security = HTTPBearer()
@@ -14,7 +17,6 @@ security = HTTPBearer()
 def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
     """Dependency to get current authenticated user"""
     token = credentials.credentials
-    auth_service = AuthService()
     username = auth_service.verify_token(token)
 
     if not username:
@@ -28,7 +30,11 @@ def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(securit
 
 
 @router.get("")
-async def get_dashboard(light: bool = False, current_user: str = Depends(get_current_user)):
+async def get_dashboard(light: bool = False, sections: Optional[str] = None, current_user: str = Depends(get_current_user)):
     """Get aggregated dashboard payload for first paint."""
+    try:
+        requested = parse_sections(sections)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     collector = StatusCollector()
-    return collector.get_full_status(light=light)
+    return await WorkerPools.run("file_io", collector.get_full_status, light=light, sections=requested)
@@ -2,7 +2,7 @@
 from fastapi import APIRouter, Body, Depends, HTTPException
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
-from services.auth import AuthService
+from services.auth import auth_service
 from services.integration_store import IntegrationStore
 from services.usage_service import UsageService
 from models import IntegrationsUpdateRequest
@@ -13,7 +13,6 @@ security = HTTPBearer()
 
 def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
     token = credentials.credentials
-    auth_service = AuthService()
     username = auth_service.verify_token(token)
     if not username:
         raise HTTPException(
@@ -1,11 +1,16 @@
 """
 Status API routes - system health and status
 """
+from typing import Optional
+
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
-from services.auth import AuthService
-from services.collector import StatusCollector
+from services.auth import auth_service
+from services.collector import StatusCollector, parse_sections
+from services.config_cache import ConfigCache
+from services.status_hub import StatusHub
+from services.worker_pools import WorkerPools
 
 router = APIRouter(prefix="/status", tags=["Status"])
 security = HTTPBearer()
@@ -14,7 +19,6 @@ security = HTTPBearer()
 def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
     """Dependency to get current authenticated user"""
     token = credentials.credentials
-    auth_service = AuthService()
     username = auth_service.verify_token(token)
 
     if not username:
@@ -28,31 +32,53 @@ def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(securit
 
 
 @router.get("/")
-async def get_status(light: bool = False, current_user: str = Depends(get_current_user)):
+async def get_status(light: bool = False, sections: Optional[str] = None, current_user: str = Depends(get_current_user)):
     """Get complete system status"""
+    try:
+        requested = parse_sections(sections)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     collector = StatusCollector()
-    return collector.get_full_status(light=light)
+    return await WorkerPools.run("file_io", collector.get_full_status, light=light, sections=requested)
 
 
 @router.get("/system")
 async def get_system_health(current_user: str = Depends(get_current_user)):
     """Get system health metrics"""
     collector = StatusCollector()
-    return collector.get_system_health()
+    return await WorkerPools.run("file_io", collector.get_system_health)
 
 
 @router.get("/gateway")
 async def get_gateway_status(current_user: str = Depends(get_current_user)):
     """Get Gateway status"""
     collector = StatusCollector()
-    return collector.get_gateway_status()
+    return await WorkerPools.run("file_io", collector.get_gateway_status)
+
+
+@router.get("/hub")
+async def get_hub_stats(current_user: str = Depends(get_current_user)):
+    """Get live status broadcast hub metrics"""
+    return StatusHub.stats()
+
+
+@router.get("/config-cache")
+async def get_config_cache_stats(current_user: str = Depends(get_current_user)):
+    """Get parsed-config cache hit/miss counters"""
+    return ConfigCache.stats()
+
+
+@router.get("/pools")
+async def get_worker_pool_stats(current_user: str = Depends(get_current_user)):
+    """Get queue depth and wait time per worker pool"""
+    return WorkerPools.stats()
 
 
 @router.get("/node")
 async def get_node_info(current_user: str = Depends(get_current_user)):
     """Get node information"""
     collector = StatusCollector()
-    info = collector.get_node_info()
+    info = await WorkerPools.run("file_io", collector.get_node_info)
 
     if not info:
         raise HTTPException(status_code=404, detail="Node info not found")
@@ -64,7 +90,7 @@ async def get_node_info(current_user: str = Depends(get_current_user)):
 async def get_log_info(current_user: str = Depends(get_current_user)):
     """Get log file information"""
     collector = StatusCollector()
-    return collector.get_log_info()
+    return await WorkerPools.run("file_io", collector.get_log_info)
 
 
 @router.get("/logs/content")
@@ -72,7 +98,7 @@ async def get_log_content(current_user: str = Depends(get_current_user), lines:
     """Get recent log content"""
     from services.executor import OperationExecutor
     executor = OperationExecutor()
-    result = executor.get_recent_logs(lines)
+    result = await WorkerPools.run("file_io", executor.get_recent_logs, lines)
 
     if not result.success:
         raise HTTPException(status_code=404, detail=result.message)
@@ -1,13 +1,17 @@
 """
 Tasks/Todos API routes - todo and task management
 """
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
-from services.auth import AuthService
+from services.auth import auth_service
 from services.collector import StatusCollector
 from services.task_store import TaskStore
-from models import TodoCreateRequest
+from services.worker_pools import WorkerPools
+from config import TASK_BATCH_MAX_OPS
+from models import TaskBatchRequest, TodoCreateRequest
 
 router = APIRouter(prefix="/tasks", tags=["Tasks"])
 security = HTTPBearer()
@@ -16,7 +20,6 @@ security = HTTPBearer()
 def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
     """Dependency to get current authenticated user"""
     token = credentials.credentials
-    auth_service = AuthService()
     username = auth_service.verify_token(token)
 
     if not username:
@@ -29,25 +32,58 @@ def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(securit
     return username
 
 
+async def _query_tasks(completed: bool, limit: int, cursor: Optional[str], list_name: Optional[str],
+                       source: Optional[str], due_from: Optional[str], due_to: Optional[str], q: Optional[str]):
+    try:
+        return await WorkerPools.run(
+            "file_io", TaskStore.query_tasks, completed=completed, limit=limit, cursor=cursor,
+            list_name=list_name, source=source, due_from=due_from, due_to=due_to, q=q,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @router.get("/todos")
-async def get_todos(current_user: str = Depends(get_current_user)):
-    """Get pending todos from local store."""
-    collector = StatusCollector()
-    return {"todos": collector.get_todos()}
+async def get_todos(
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    list_name: Optional[str] = None,
+    source: Optional[str] = None,
+    due_from: Optional[str] = None,
+    due_to: Optional[str] = None,
+    q: Optional[str] = None,
+    current_user: str = Depends(get_current_user)
+):
+    """Get pending todos, newest first. Pass ``next_cursor`` back as ``cursor`` for the next page."""
+    page = await _query_tasks(False, limit, cursor, list_name, source, due_from, due_to, q)
+    return {"todos": page["items"], "next_cursor": page["next_cursor"], "version": page["version"]}
 
 
 @router.get("/completed")
-async def get_completed_tasks(current_user: str = Depends(get_current_user)):
-    """Get completed tasks from local store."""
-    collector = StatusCollector()
-    return {"tasks": collector.get_completed_tasks()}
+async def get_completed_tasks(
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    list_name: Optional[str] = None,
+    source: Optional[str] = None,
+    due_from: Optional[str] = None,
+    due_to: Optional[str] = None,
+    q: Optional[str] = None,
+    current_user: str = Depends(get_current_user)
+):
+    """Get completed tasks, most recently completed first, with the same paging/filters as /todos."""
+    page = await _query_tasks(True, limit, cursor, list_name, source, due_from, due_to, q)
+    return {"tasks": page["items"], "next_cursor": page["next_cursor"], "version": page["version"]}
 
 
 @router.get("/history")
-async def get_history_tasks(current_user: str = Depends(get_current_user)):
-    """Alias for completed tasks (history)."""
-    collector = StatusCollector()
-    return collector.get_completed_tasks()
+async def get_history_tasks(
+    limit: int = Query(30, ge=1, le=200),
+    cursor: Optional[str] = None,
+    current_user: str = Depends(get_current_user)
+):
+    """Completed tasks (history), paged like /completed."""
+    page = await _query_tasks(True, limit, cursor, None, None, None, None, None)
+    return {"tasks": page["items"], "next_cursor": page["next_cursor"], "version": page["version"]}
 
 
 @router.post("/sync")
@@ -67,7 +103,8 @@ async def sync_with_apple(current_user: str = Depends(get_current_user)):
 async def create_todo(payload: TodoCreateRequest, current_user: str = Depends(get_current_user)):
     """Create todo item in local store."""
     try:
-        local_created = TaskStore.create_todo(
+        created = await WorkerPools.run(
+            "file_io", TaskStore.create_todo,
             title=payload.title,
             list_name=payload.list_name or "默认列表",
             due_date=payload.due_date
@@ -79,37 +116,57 @@ async def create_todo(payload: TodoCreateRequest, current_user: str = Depends(ge
     return {
         "success": True,
         "message": "任务已创建",
-        "data": local_created,
-        "todos": TaskStore.list_todos()
+        "data": created["task"],
+        "version": created["version"],
     }
 
 
 @router.post("/todos/{task_id}/complete")
 async def complete_todo(task_id: str, current_user: str = Depends(get_current_user)):
     """Complete local task."""
-    task = TaskStore.complete_todo(task_id)
-    if not task:
+    done = await WorkerPools.run("file_io", TaskStore.complete_todo, task_id)
+    if not done:
         raise HTTPException(status_code=404, detail="任务不存在")
 
     StatusCollector.invalidate_todos_cache()
     return {
         "success": True,
         "message": "任务已完成",
-        "todos": TaskStore.list_todos(),
-        "history": TaskStore.list_completed(limit=30),
+        "data": done["task"],
+        "version": done["version"],
     }
 
 
 @router.post("/history/{task_id}/reopen")
 async def reopen_task(task_id: str, current_user: str = Depends(get_current_user)):
     """Reopen local completed task."""
-    task = TaskStore.reopen_task(task_id)
-    if not task:
+    reopened = await WorkerPools.run("file_io", TaskStore.reopen_task, task_id)
+    if not reopened:
         raise HTTPException(status_code=404, detail="历史任务不存在")
     StatusCollector.invalidate_todos_cache()
     return {
         "success": True,
         "message": "任务已恢复",
-        "todos": TaskStore.list_todos(),
-        "history": TaskStore.list_completed(limit=30),
+        "data": reopened["task"],
+        "version": reopened["version"],
+    }
+
+
+@router.post("/batch")
+async def batch_tasks(payload: TaskBatchRequest, current_user: str = Depends(get_current_user)):
+    """Create/complete/reopen/delete many tasks in one write; results are reported per item."""
+    if not payload.ops:
+        raise HTTPException(status_code=400, detail="批量操作不能为空")
+    if len(payload.ops) > TASK_BATCH_MAX_OPS:
+        raise HTTPException(status_code=400, detail=f"单次最多 {TASK_BATCH_MAX_OPS} 项操作")
+
+    outcome = await WorkerPools.run("file_io", TaskStore.apply_batch, [item.dict() for item in payload.ops])
+    if outcome["applied"]:
+        StatusCollector.invalidate_todos_cache()
+    failed = len(outcome["results"]) - outcome["applied"]
+    return {
+        "success": failed == 0,
+        "message": f"已处理 {outcome['applied']} 项，失败 {failed} 项",
+        "results": outcome["results"],
+        "version": outcome["version"],
     }
@@ -2,8 +2,10 @@
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
-from services.auth import AuthService
+from services.auth import auth_service
+from services.http_client import HttpClient
 from services.usage_service import UsageService
+from services.worker_pools import WorkerPools
 
 router = APIRouter(prefix="/usage", tags=["Usage"])
 security = HTTPBearer()
@@ -11,7 +13,6 @@ security = HTTPBearer()
 
 def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
     token = credentials.credentials
-    auth_service = AuthService()
     username = auth_service.verify_token(token)
     if not username:
         raise HTTPException(
@@ -24,4 +25,9 @@ def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(securit
 
 @router.get("/panels")
 async def get_usage_panels(current_user: str = Depends(get_current_user)):
-    return {"panels": UsageService.get_usage_panels()}
+    return {"panels": await WorkerPools.run("file_io", UsageService.get_usage_panels)}
+
+
+@router.get("/http-stats")
+async def get_http_stats(current_user: str = Depends(get_current_user)):
+    return HttpClient.stats()
@@ -23,10 +23,25 @@ MINIMAX_USAGE_IS_REMAINING = os.environ.get("MINIMAX_USAGE_IS_REMAINING", "0") =
 JWT_SECRET = "openclaw-dashboard-secret-key-change-in-production"
 JWT_ALGORITHM = "HS256"
 JWT_EXPIRE_MINUTES = 60 * 24 * 7  # 7 days
+TOKEN_CACHE_SIZE = 1024  # Verified tokens kept in memory (LRU, each until its exp)
 
 # Password file
 PASSWORDS_FILE = OPENCLAW_DIR / "dashboard_users.json"
 INTEGRATIONS_FILE = OPENCLAW_DIR / "dashboard_integrations.json"
+LOG_INDEX_FILE = OPENCLAW_DIR / "dashboard_log_index.json"
+
+# Task store
+TASK_JOURNAL_FSYNC_INTERVAL = 1.0  # Seconds; journal fsyncs within this window are batched
+TASK_JOURNAL_COMPACT_OPS = 500  # Fold the journal into the snapshot after this many ops
+TASK_BATCH_MAX_OPS = 500  # Items accepted by one POST /api/tasks/batch
+TASK_STORE_BACKEND = os.getenv("TASK_STORE_BACKEND", "file").lower()  # "file" (~/.openclaw JSON) or "sql" (DATABASE_URL)
+
+# OpenClaw files read by the status collector
+NODE_CONFIG_FILE = OPENCLAW_DIR / "node.json"
+OPENCLAW_CONFIG_FILE = OPENCLAW_DIR / "openclaw.json"
+MODELS_CONFIG_FILE = OPENCLAW_DIR / "agents" / "main" / "agent" / "models.json"
+SUBAGENT_RUNS_FILE = OPENCLAW_DIR / "subagents" / "runs.json"
+SUBAGENT_RECENT_LIMIT = 20  # Non-running runs included in status payloads
 
 # Default admin credentials (first run only)
 DEFAULT_ADMIN = {
@@ -35,5 +50,63 @@ DEFAULT_ADMIN = {
     "must_change_password": True
 }
 
+# Gateway process detection
+GATEWAY_PROCESS_MATCH = "openclaw-gateway"
+GATEWAY_RESCAN_INTERVAL = 5  # Min seconds between process-table scans while gateway is down
+
+# Gateway chat connection pool
+GATEWAY_URL = os.environ.get("GATEWAY_URL", "ws://127.0.0.1:18789")
+GATEWAY_POOL_SIZE = int(os.environ.get("GATEWAY_POOL_SIZE", "2"))  # Long-lived sockets to the gateway
+GATEWAY_MAX_IN_FLIGHT = 16  # Outstanding requests per socket before callers wait
+GATEWAY_ACQUIRE_TIMEOUT = 10.0  # Seconds a caller waits for a free slot before giving up
+GATEWAY_REQUEST_TIMEOUT = 60.0  # Seconds to wait for a reply
+GATEWAY_RECONNECT_MAX_DELAY = 30.0  # Cap for exponential reconnect backoff
+
+# Chat history replay over the chat WebSocket
+CHAT_HISTORY_BATCH = 50  # Newest messages sent in one frame when the socket connects
+CHAT_HISTORY_MAX_PAGE = 200  # Largest "load older" page a client may ask for
+
+# Shared outbound HTTP client
+HTTP_POOL_MAX_PER_HOST = 4  # Concurrent requests and idle keep-alive sockets per host
+HTTP_POOL_IDLE_SECONDS = 60  # Drop pooled sockets idle longer than this
+
+# Thread pools for blocking work, per workload class
+WORKER_POOL_SIZES = {
+    "subprocess": 2,  # openclaw/pkill/curl CLI calls
+    "file_io": 4,  # status collection, log scans, backups
+    "network": 8,  # provider quota/usage HTTP calls
+    "db": 4,  # chat history reads/writes (SQLAlchemy sessions)
+}
+
+# Usage panel provider fetches
+USAGE_FETCH_DEADLINE = 3.0  # Seconds a dashboard request waits for providers
+# Per-provider panel freshness; a provider's integration config may override with cache_ttl_seconds.
+USAGE_PROVIDER_TTLS = {
+    "minimax": int(os.environ.get("USAGE_TTL_MINIMAX", "120")),  # quota windows move slowly
+    "openai": int(os.environ.get("USAGE_TTL_OPENAI", "600")),  # usage is bucketed per day
+    "gemini": int(os.environ.get("USAGE_TTL_GEMINI", "300")),
+    "glm": int(os.environ.get("USAGE_TTL_GLM", "300")),
+}
+USAGE_DEFAULT_TTL = 60
+USAGE_ERROR_RETRY_TTL = 30  # Retry sooner when all we have for a provider is an error
+
 # Status check intervals (seconds)
 STATUS_CACHE_TTL = 10  # Cache duration for status data
+# Per-section cache durations for StatusCollector.get_full_status; sections with declared
+# dependencies (collector.SECTION_DEPS) also rebuild as soon as those change
+STATUS_SECTION_TTLS = {
+    "node": 300,
+    "system": 2,
+    "agents": 5,
+    "channels": 300,
+    "logs": 15,
+    "todos": 300,
+    "minimax": 60,
+    "usage": 5,
+}
+STATUS_PUSH_INTERVAL = 5  # Shared /ws sampler tick
+WATCH_POLL_INTERVAL = 1.0  # Stat-polling period for watched files inotify cannot cover
+WATCH_DEBOUNCE_SECONDS = 0.1  # Let a burst of writes settle before pushing
+SYSTEM_SAMPLE_INTERVAL = 2  # Background CPU/memory/disk sampling period
+SYSTEM_SAMPLE_WINDOW = 300  # Rolling window kept for averages (5 minutes)
+SYSTEM_FIRST_SAMPLE_DELAY = 0.1  # CPU measurement interval for the first reading after start
@@ -4,7 +4,7 @@ Database configuration and models for OpenClaw Dashboard
 import os
 from datetime import datetime
 from typing import Optional
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, Text, ForeignKey
+from sqlalchemy import create_engine, Column, Integer, String, DateTime, Text, ForeignKey, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import NullPool
@@ -51,6 +51,18 @@ def get_db():
 def init_db():
     """Initialize database tables"""
     Base.metadata.create_all(bind=engine)
+    migrate_indexes()
+
+
+def migrate_indexes():
+    """Add indexes declared after a table was first created.
+
+    create_all() skips tables that already exist, so their new indexes are
+    created here; existing ones are left alone.
+    """
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
 
 
 # Models
@@ -68,6 +80,10 @@ class User(Base):
 class ChatMessage(Base):
     """Chat message model for cross-device sync"""
     __tablename__ = "chat_messages"
+    __table_args__ = (
+        # History is always read per user, newest first, paged by (created_at, id)
+        Index("ix_chat_messages_user_created", "user_id", "created_at", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -86,3 +102,32 @@ class UserSettings(Base):
     language = Column(String, default='zh')  # 'zh' or 'en'
     bg_image = Column(Text, nullable=True)  # Base64 encoded image
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class Task(Base):
+    """Dashboard todo/history item (used when TASK_STORE_BACKEND=sql)"""
+    __tablename__ = "tasks"
+    __table_args__ = (
+        Index("ix_tasks_status_created", "status", "created_at"),
+        Index("ix_tasks_status_completed", "status", "completed_at"),
+        Index("ix_tasks_list_name", "list_name"),
+        Index("ix_tasks_source", "source"),
+    )
+
+    id = Column(String(64), primary_key=True)
+    title = Column(Text, nullable=False)
+    status = Column(String(16), nullable=False, default='pending')  # 'pending' or 'completed'
+    list_name = Column(String, nullable=False, default='默认列表')
+    source = Column(String(32), nullable=False, default='local')
+    due_date = Column(String, nullable=True)
+    # ISO-8601 strings, same representation the JSON store and API use; they sort chronologically
+    created_at = Column(String(32), nullable=False)
+    completed_at = Column(String(32), nullable=True)
+
+
+class TaskMeta(Base):
+    """Key/value bookkeeping for the task table (version counter, import/bootstrap flags)"""
+    __tablename__ = "task_meta"
+
+    key = Column(String(64), primary_key=True)
+    value = Column(Text, nullable=True)
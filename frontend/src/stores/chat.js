@@ -10,6 +10,7 @@ export const useChatStore = defineStore('chat', () => {
   const loading = ref(false)
   const ws = ref(null)
   const wsConnected = ref(false)
+  const olderBefore = ref(null) // message id to page back from, null when nothing older
 
   // Getters
   const messageCount = computed(() => messages.value.length)
@@ -60,7 +61,24 @@ export const useChatStore = defineStore('chat', () => {
     
     ws.value.onmessage = (event) => {
       const data = JSON.parse(event.data)
-      if (data.type === 'message' || data.type === 'history') {
+      if (data.type === 'history_batch') {
+        messages.value = data.before == null ? data.messages : [...data.messages, ...messages.value]
+        olderBefore.value = data.has_more ? data.next_before : null
+        localStorage.setItem('chat-history', JSON.stringify(messages.value))
+      } else if (data.type === 'delta') {
+        let reply = messages.value.find(m => m.id === data.id)
+        if (!reply) {
+          messages.value.push({ id: data.id, role: 'assistant', content: '', timestamp: new Date().toISOString() })
+          reply = messages.value[messages.value.length - 1]
+        }
+        reply.content += data.content
+      } else if (data.type === 'message' && data.id && messages.value.some(m => m.id === data.id)) {
+        // Complete reply replaces the one assembled from deltas
+        const reply = messages.value.find(m => m.id === data.id)
+        reply.content = data.content
+        reply.timestamp = data.timestamp
+        localStorage.setItem('chat-history', JSON.stringify(messages.value))
+      } else if (data.type === 'message' || data.type === 'history') {
         messages.value.push({
           role: data.role,
           content: data.content,
@@ -104,6 +122,18 @@ export const useChatStore = defineStore('chat', () => {
     return true
   }
 
+  function loadOlder(limit = 50) {
+    if (olderBefore.value == null || !ws.value || ws.value.readyState !== WebSocket.OPEN) return false
+    ws.value.send(JSON.stringify({ type: 'load_older', before: olderBefore.value, limit }))
+    return true
+  }
+
+  function cancelReply() {
+    if (ws.value && ws.value.readyState === WebSocket.OPEN) {
+      ws.value.send(JSON.stringify({ type: 'cancel' }))
+    }
+  }
+
   function disconnect() {
     if (ws.value) {
       ws.value.close()
@@ -116,11 +146,14 @@ export const useChatStore = defineStore('chat', () => {
     messages,
     loading,
     wsConnected,
+    olderBefore,
     messageCount,
     loadHistory,
     clearHistory,
     connectWebSocket,
     sendMessage,
+    loadOlder,
+    cancelReply,
     disconnect
   }
 })
@@ -26,6 +26,15 @@ function mergeStatusPayload(current, incoming, preserveHeavy = false) {
   return merged
 }
 
+function withoutTask(list, taskId) {
+  return (list || []).filter(task => task.id !== taskId)
+}
+
+// Newest-first lists: a changed task moves to the head
+function upsertTask(list, task) {
+  return [task, ...withoutTask(list, task.id)]
+}
+
 export const useDashboardStore = defineStore('dashboard', {
   state: () => ({
     status: null,
@@ -38,10 +47,13 @@ export const useDashboardStore = defineStore('dashboard', {
     wsConnected: false,
     wsRetryTimer: null,
     wsReconnectAttempts: 0,
+    wsSeq: 0,
     refreshTick: 0,
     historyTasks: [],
     historyLoading: false,
     historyLoaded: false,
+    historyNextCursor: null,
+    taskVersion: 0,
     integrations: null,
     integrationLoading: false
   }),
@@ -152,16 +164,23 @@ export const useDashboardStore = defineStore('dashboard', {
       socket.onopen = () => {
         this.wsConnected = true
         this.wsReconnectAttempts = 0
+        this.wsSeq = 0
         this.error = null
       }
 
+      // Server sends one status_snapshot, then status_delta frames with only the changed sections
       socket.onmessage = (event) => {
         try {
           const message = JSON.parse(event.data)
-          if (message.type === 'status_update' && message.payload) {
-            this.status = mergeStatusPayload(this.status, message.payload, true)
-            this.lastUpdated = new Date()
+          if (message.type !== 'status_snapshot' && message.type !== 'status_delta') return
+          if (message.type === 'status_delta' && !this.wsSeq) {
+            this.resyncWebSocket()
+            return
           }
+          const sections = { ...(message.sections || {}), timestamp: message.timestamp }
+          this.status = mergeStatusPayload(this.status, sections)
+          this.wsSeq = message.seq
+          this.lastUpdated = new Date()
         } catch (_) {
           // ignore malformed ws payload
         }
@@ -186,6 +205,12 @@ export const useDashboardStore = defineStore('dashboard', {
       }
     },
 
+    resyncWebSocket() {
+      if (this.ws && this.ws.readyState === WebSocket.OPEN) {
+        this.ws.send(JSON.stringify({ type: 'resync' }))
+      }
+    },
+
     disconnectWebSocket() {
       if (this.wsRetryTimer) {
         clearTimeout(this.wsRetryTimer)
@@ -197,6 +222,7 @@ export const useDashboardStore = defineStore('dashboard', {
       }
       this.wsConnected = false
       this.wsReconnectAttempts = 0
+      this.wsSeq = 0
     },
 
     async fetchHistoryTasks() {
@@ -205,7 +231,8 @@ export const useDashboardStore = defineStore('dashboard', {
       this.error = null
       try {
         const response = await axios.get(`${API_URL}/tasks/history`)
-        this.historyTasks = response.data || []
+        this.historyTasks = response.data?.tasks || []
+        this.historyNextCursor = response.data?.next_cursor || null
         this.historyLoaded = true
       } catch (err) {
         this.error = err.response?.data?.detail || 'Failed to load history tasks'
@@ -214,6 +241,21 @@ export const useDashboardStore = defineStore('dashboard', {
       }
     },
 
+    async fetchMoreHistoryTasks() {
+      if (this.historyLoading || !this.historyNextCursor) return
+      this.historyLoading = true
+      try {
+        const response = await axios.get(`${API_URL}/tasks/history`, { params: { cursor: this.historyNextCursor } })
+        const seen = new Set(this.historyTasks.map(t => t.id))
+        this.historyTasks = [...this.historyTasks, ...(response.data?.tasks || []).filter(t => !seen.has(t.id))]
+        this.historyNextCursor = response.data?.next_cursor || null
+      } catch (err) {
+        this.error = err.response?.data?.detail || 'Failed to load history tasks'
+      } finally {
+        this.historyLoading = false
+      }
+    },
+
     async reloadHistoryTasks() {
       this.historyLoaded = false
       await this.fetchHistoryTasks()
@@ -222,9 +264,8 @@ export const useDashboardStore = defineStore('dashboard', {
     async createTodo(payload) {
       try {
         const response = await axios.post(`${API_URL}/tasks/todos`, payload)
-        if (response.data?.todos) {
-          this.status = this.status || {}
-          this.status.todos = response.data.todos
+        if (response.data?.data) {
+          this.applyTaskChange(response.data.data, response.data.version)
         } else {
           await this.fetchDashboard(false)
         }
@@ -291,13 +332,26 @@ export const useDashboardStore = defineStore('dashboard', {
       return this.validateIntegration(provider, draftConfig)
     },
 
+    // Merge one changed task (as returned by the task mutation endpoints) into local lists
+    applyTaskChange(task, version) {
+      if (!task) return
+      this.status = this.status || {}
+      if (task.completed) {
+        this.status.todos = withoutTask(this.status.todos, task.id)
+        this.status.completed_tasks = upsertTask(this.status.completed_tasks, task)
+        if (this.historyLoaded) this.historyTasks = upsertTask(this.historyTasks, task)
+      } else {
+        this.status.todos = upsertTask(this.status.todos, task)
+        this.status.completed_tasks = withoutTask(this.status.completed_tasks, task.id)
+        this.historyTasks = withoutTask(this.historyTasks, task.id)
+      }
+      if (typeof version === 'number') this.taskVersion = version
+    },
+
     async completeTodo(taskId) {
       try {
         const response = await axios.post(`${API_URL}/tasks/todos/${taskId}/complete`)
-        this.status = this.status || {}
-        this.status.todos = response.data?.todos || []
-        this.historyTasks = response.data?.history || this.historyTasks
-        this.historyLoaded = true
+        this.applyTaskChange(response.data?.data, response.data?.version)
         this.lastUpdated = new Date()
         this.error = null
         return { success: true, message: response.data?.message || '任务已完成' }
@@ -311,10 +365,7 @@ export const useDashboardStore = defineStore('dashboard', {
     async reopenTask(taskId) {
       try {
         const response = await axios.post(`${API_URL}/tasks/history/${taskId}/reopen`)
-        this.status = this.status || {}
-        this.status.todos = response.data?.todos || this.status.todos || []
-        this.historyTasks = response.data?.history || this.historyTasks
-        this.historyLoaded = true
+        this.applyTaskChange(response.data?.data, response.data?.version)
         this.lastUpdated = new Date()
         this.error = null
         return { success: true, message: response.data?.message || '任务已恢复' }
@@ -29,6 +29,20 @@ class TodoCreateRequest(BaseModel):
     due_date: Optional[str] = None
 
 
+class TaskBatchItem(BaseModel):
+    """批量任务操作中的一项：create 需要 title，其余操作需要 id"""
+    op: str  # create | complete | reopen | delete
+    id: Optional[str] = None
+    title: Optional[str] = None
+    list_name: Optional[str] = "默认列表"
+    due_date: Optional[str] = None
+
+
+class TaskBatchRequest(BaseModel):
+    """批量任务操作请求"""
+    ops: List[TaskBatchItem] = Field(default_factory=list)
+
+
 class IntegrationsUpdateRequest(BaseModel):
     """更新模型集成配置请求"""
     providers: Dict[str, Dict[str, Any]]
@@ -62,11 +76,17 @@ class GatewayStatus(BaseModel):
     running: bool
     pid: Optional[int] = None
     uptime: Optional[str] = None
+    rss_bytes: Optional[int] = None
+    cpu_percent: Optional[float] = None
+    num_threads: Optional[int] = None
+    num_fds: Optional[int] = None
 
 class SystemHealth(BaseModel):
     cpu_percent: float
     memory_percent: float
     disk_usage_percent: float
+    cpu_avg_1m: Optional[float] = None
+    cpu_avg_5m: Optional[float] = None
     gateway: GatewayStatus
 
 class NodeInfo(BaseModel):
@@ -104,7 +124,10 @@ class SubAgentRun(BaseModel):
 class AgentStatus(BaseModel):
     main_agent: AgentConfig
     subagents_running: int
+    # Running runs plus the most recent others; page the full history via /api/agents/subagents
     subagent_runs: List[SubAgentRun] = []
+    subagent_total: int = 0
+    subagent_counts: Dict[str, int] = {}
 
 # ============== Channel Models ==============
 
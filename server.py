@@ -2,6 +2,8 @@
 OpenClaw Dashboard - Main FastAPI Server
 """
 import asyncio
+import json
+
 from fastapi import FastAPI
 from fastapi import WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
@@ -21,8 +23,13 @@ from api.todos import router as todos_router
 from api.integrations import router as integrations_router
 from api.usage import router as usage_router
 from api.chat import router as chat_router
-from services.auth import AuthService
-from services.collector import StatusCollector
+from services.auth import auth_service
+from services.collector import WATCHED_FILES
+from services.file_watcher import FileWatcher
+from services.gateway_client import gateway_client
+from services.status_hub import StatusHub
+from services.system_sampler import SystemSampler
+from services.worker_pools import WorkerPools
 
 
 @asynccontextmanager
@@ -34,8 +41,17 @@ async def lifespan(app: FastAPI):
     from database import init_db
     init_db()
     print("Database initialized")
+    SystemSampler.start()
+    StatusHub.start()
+    FileWatcher.start(WATCHED_FILES, StatusHub.notify_change)
+    await gateway_client.start()
     yield
     # Shutdown
+    await gateway_client.stop()
+    FileWatcher.stop()
+    await StatusHub.stop()
+    SystemSampler.stop()
+    WorkerPools.shutdown()
     print("OpenClaw Dashboard shutting down")
 
 
@@ -106,22 +122,33 @@ async def health_check():
 async def ws_status(websocket: WebSocket):
     """WebSocket push channel for dashboard live status."""
     token = websocket.query_params.get("token")
-    auth_service = AuthService()
     if not token or not auth_service.verify_token(token):
         await websocket.close(code=1008)
         return
 
     await websocket.accept()
-    collector = StatusCollector()
+    subscriber = StatusHub.subscribe()
 
-    try:
+    async def send_frames():
         while True:
-            payload = collector.get_full_status(light=True)
-            await websocket.send_json({
-                "type": "status_update",
-                "payload": payload
-            })
-            await asyncio.sleep(5)
+            frame = await subscriber.next_frame()
+            await websocket.send_text(frame)
+
+    async def receive_commands():
+        # Clients may ask for a full snapshot, e.g. after missing updates while in the background.
+        while True:
+            try:
+                message = json.loads(await websocket.receive_text())
+            except ValueError:
+                continue
+            if isinstance(message, dict) and message.get("type") == "resync":
+                subscriber.request_resync()
+
+    tasks = [asyncio.create_task(send_frames()), asyncio.create_task(receive_commands())]
+    try:
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            task.result()
     except WebSocketDisconnect:
         return
     except Exception:
@@ -129,6 +156,10 @@ async def ws_status(websocket: WebSocket):
             await websocket.close(code=1011)
         except Exception:
             pass
+    finally:
+        for task in tasks:
+            task.cancel()
+        StatusHub.unsubscribe(subscriber)
 
 
 if __name__ == "__main__":
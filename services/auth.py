@@ -1,17 +1,23 @@
 """
 Authentication service for OpenClaw Dashboard
 """
+import copy
+import hashlib
 import json
+import os
+import threading
+import time
+from collections import OrderedDict
 import bcrypt
 from jose import jwt, JWTError
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
 from config import (
-    JWT_SECRET, JWT_ALGORITHM, JWT_EXPIRE_MINUTES,
+    JWT_SECRET, JWT_ALGORITHM, JWT_EXPIRE_MINUTES, TOKEN_CACHE_SIZE,
     PASSWORDS_FILE, DEFAULT_ADMIN, OPENCLAW_DIR
 )
 from models import UserCreate, UserResponse
@@ -20,10 +26,18 @@ security = HTTPBearer()
 
 
 class AuthService:
-    """Handles user authentication and management"""
-
-    def __init__(self):
-        self._ensure_users_file()
+    """Handles user authentication and management.
+
+    State is process-wide: users are cached until the users file changes and
+    verified tokens are kept in an LRU keyed by token hash, so constructing the
+    service and checking a token touch neither the disk nor the JWT library.
+    """
+    _lock = threading.RLock()
+    _users: Optional[Dict[str, Any]] = None
+    _users_fp: Optional[Tuple[int, int]] = None
+    _tokens: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()  # sha256(token) -> (username, exp)
+    _token_hits: int = 0
+    _token_misses: int = 0
 
     def _ensure_users_file(self):
         """Create users file if it doesn't exist"""
@@ -48,22 +62,44 @@ class AuthService:
         """Verify a password against a hash"""
         return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
 
-    def _load_users(self) -> Dict[str, Any]:
-        """Load users from file"""
-        if not PASSWORDS_FILE.exists():
+    @staticmethod
+    def _users_fingerprint() -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(PASSWORDS_FILE)
+            return st.st_mtime_ns, st.st_size
+        except OSError:
+            return None
+
+    def _cached_users(self) -> Dict[str, Any]:
+        """Shared users dict, re-read only when the file's (mtime, size) changes. Do not mutate."""
+        cls = type(self)
+        fp = self._users_fingerprint()
+        if fp is None:
             self._ensure_users_file()
+            fp = self._users_fingerprint()
+        with cls._lock:
+            if cls._users is None or fp != cls._users_fp:
+                with open(PASSWORDS_FILE) as f:
+                    cls._users = json.load(f)
+                cls._users_fp = fp
+            return cls._users
 
-        with open(PASSWORDS_FILE) as f:
-            return json.load(f)
+    def _load_users(self) -> Dict[str, Any]:
+        """Load users (a private copy callers may modify and pass to _save_users)"""
+        return copy.deepcopy(self._cached_users())
 
     def _save_users(self, users: Dict[str, Any]):
         """Save users to file"""
-        with open(PASSWORDS_FILE, 'w') as f:
-            json.dump(users, f, indent=2)
+        cls = type(self)
+        with cls._lock:
+            with open(PASSWORDS_FILE, 'w') as f:
+                json.dump(users, f, indent=2)
+            cls._users = copy.deepcopy(users)
+            cls._users_fp = self._users_fingerprint()
 
     def authenticate(self, username: str, password: str) -> Optional[Dict[str, Any]]:
         """Authenticate a user and return user info if successful"""
-        users = self._load_users()
+        users = self._cached_users()
 
         if username not in users:
             return None
@@ -88,11 +124,44 @@ class AuthService:
 
     def verify_token(self, token: str) -> Optional[str]:
         """Verify a JWT token and return username"""
+        cls = type(self)
+        key = hashlib.sha256(token.encode("utf-8")).hexdigest()
+        now = time.time()
+        with cls._lock:
+            cached = cls._tokens.get(key)
+            if cached is not None:
+                if cached[1] > now:
+                    cls._tokens.move_to_end(key)
+                    cls._token_hits += 1
+                    return cached[0]
+                del cls._tokens[key]
+            cls._token_misses += 1
+
         try:
             payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
-            return payload.get("sub")
         except JWTError:
             return None
+        username = payload.get("sub")
+        exp = payload.get("exp")
+        # Only tokens with an expiry are cached, and never past it.
+        if username and isinstance(exp, (int, float)):
+            with cls._lock:
+                cls._tokens[key] = (username, float(exp))
+                while len(cls._tokens) > TOKEN_CACHE_SIZE:
+                    cls._tokens.popitem(last=False)
+        return username
+
+    def _forget_tokens(self, username: str):
+        """Drop cached verifications for ``username`` (e.g. after the user is deleted)."""
+        cls = type(self)
+        with cls._lock:
+            for key in [k for k, (name, _) in cls._tokens.items() if name == username]:
+                del cls._tokens[key]
+
+    @classmethod
+    def token_cache_stats(cls) -> Dict[str, int]:
+        with cls._lock:
+            return {"size": len(cls._tokens), "hits": cls._token_hits, "misses": cls._token_misses}
 
     async def get_current_user(self, credentials: HTTPAuthorizationCredentials = Depends(security)) -> Dict[str, Any]:
         """Get current user from JWT token (FastAPI dependency)"""
@@ -107,8 +176,7 @@ class AuthService:
             )
         
         # Load user data
-        users = self._load_users()
-        if username not in users:
+        if username not in self._cached_users():
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="User not found",
@@ -164,11 +232,12 @@ class AuthService:
 
         del users[username]
         self._save_users(users)
+        self._forget_tokens(username)
         return True
 
     def list_users(self) -> list:
         """List all users (without passwords)"""
-        users = self._load_users()
+        users = self._cached_users()
 
         return [
             {
@@ -178,3 +247,7 @@ class AuthService:
             }
             for username, data in users.items()
         ]
+
+
+# Process-wide instance used by the API routes
+auth_service = AuthService()
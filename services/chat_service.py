@@ -1,23 +1,23 @@
 """
 Chat Service - Connect to OpenClaw Gateway for real AI responses
 """
-import os
-import json
 import asyncio
-import websockets
-from typing import Optional, List, Dict
+from contextlib import aclosing
+from typing import AsyncIterator, Optional, List, Dict
 from datetime import datetime
 
-# OpenClaw Gateway configuration
-GATEWAY_URL = os.environ.get('GATEWAY_URL', 'ws://127.0.0.1:18789')
+from services.gateway_client import GatewayUnavailable, frame_text, gateway_client, is_final_frame
+
+
+class ReplyInterrupted(Exception):
+    """The gateway failed after part of the reply had already been produced"""
 
 
 class ChatService:
     """Service to handle chat interactions with OpenClaw Gateway"""
     
     def __init__(self):
-        self.gateway_url = GATEWAY_URL
-        self.pending_responses: Dict[str, asyncio.Future] = {}
+        self.gateway = gateway_client
         
     async def generate_response(self, user_message: str, conversation_history: List[Dict] = None) -> str:
         """
@@ -30,16 +30,37 @@ class ChatService:
         Returns:
             The assistant's response from OpenClaw
         """
+        parts = []
+        async with aclosing(self.stream_response(user_message, conversation_history)) as chunks:
+            async for chunk in chunks:
+                parts.append(chunk)
+        return "".join(parts)
+
+    async def stream_response(self, user_message: str, conversation_history: List[Dict] = None) -> AsyncIterator[str]:
+        """
+        Yield the response in pieces as the gateway produces them.
+
+        Falls back to the local response when the gateway cannot be reached
+        before anything was produced; a failure after that raises
+        ReplyInterrupted so the caller knows the reply is incomplete.
+        Closing the iterator cancels the request on the gateway.
+        """
+        produced = False
         try:
             # Try to connect to OpenClaw Gateway
-            return await self._call_openclaw(user_message, conversation_history)
+            async with aclosing(self._call_openclaw(user_message, conversation_history)) as chunks:
+                async for chunk in chunks:
+                    produced = True
+                    yield chunk
         except Exception as e:
             print(f"OpenClaw connection error: {e}")
+            if produced:
+                raise ReplyInterrupted(str(e)) from e
             # Fallback to local response
-            return await self._local_response(user_message)
+            yield await self._local_response(user_message)
     
-    async def _call_openclaw(self, user_message: str, conversation_history: List[Dict] = None) -> str:
-        """Connect to OpenClaw Gateway and send message"""
+    async def _call_openclaw(self, user_message: str, conversation_history: List[Dict] = None) -> AsyncIterator[str]:
+        """Send the message to OpenClaw Gateway and yield reply chunks"""
         try:
             # Build conversation context
             context = ""
@@ -56,36 +77,36 @@ class ChatService:
             else:
                 full_message = user_message
             
-            # Connect to OpenClaw Gateway WebSocket
-            uri = f"{self.gateway_url}/ws"
-            
-            async with websockets.connect(uri, ping_interval=None) as websocket:
-                # Send message to OpenClaw
-                message_payload = {
-                    "type": "message",
-                    "text": full_message,
-                    "timestamp": datetime.utcnow().isoformat(),
-                    "source": "openclaw-dashboard"
-                }
-                
-                await websocket.send(json.dumps(message_payload))
-                
-                # Wait for response with timeout
-                try:
-                    response = await asyncio.wait_for(
-                        websocket.recv(),
-                        timeout=60.0
-                    )
-                    
-                    # Parse response
-                    data = json.loads(response)
-                    return data.get("text", data.get("content", "收到回复但格式不正确"))
-                    
-                except asyncio.TimeoutError:
-                    return "OpenClaw 响应超时，请稍后重试。"
-                    
-        except websockets.exceptions.ConnectionRefused:
-            raise Exception("无法连接到 OpenClaw Gateway，请确认服务已启动")
+            message_payload = {
+                "type": "message",
+                "text": full_message,
+                "timestamp": datetime.utcnow().isoformat(),
+                "source": "openclaw-dashboard",
+                "stream": True
+            }
+
+            # Sent over the shared gateway pool; no per-message handshake
+            streamed = ""
+            try:
+                async with aclosing(self.gateway.stream(message_payload)) as frames:
+                    async for frame in frames:
+                        text = frame_text(frame)
+                        if not is_final_frame(frame):
+                            streamed += text
+                            if text:
+                                yield text
+                        elif not streamed:
+                            yield text or "收到回复但格式不正确"
+                        elif text.startswith(streamed) and len(text) > len(streamed):
+                            # Final frame repeats the whole reply; send only what is new.
+                            yield text[len(streamed):]
+            except asyncio.TimeoutError:
+                if streamed:
+                    raise Exception("OpenClaw 响应超时")
+                yield "OpenClaw 响应超时，请稍后重试。"
+
+        except GatewayUnavailable as e:
+            raise Exception(f"无法连接到 OpenClaw Gateway，请确认服务已启动 ({e})")
         except Exception as e:
             raise Exception(f"OpenClaw 调用失败: {e}")
     
@@ -0,0 +1,105 @@
+"""
+Chat message storage - blocking SQLAlchemy calls for the chat API, run on the ``db`` worker pool
+"""
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+
+from database import ChatMessage, SessionLocal
+
+
+class ChatStore:
+    """Chat history reads and writes, each on its own short-lived session.
+
+    Every method blocks on the database, so async callers go through
+    ``WorkerPools.run("db", ChatStore.<method>, ...)``; no session is held
+    across awaits or shared between connections.
+    """
+
+    @classmethod
+    @contextmanager
+    def _session(cls) -> Iterator[Session]:
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    @staticmethod
+    def _to_dict(msg: ChatMessage) -> Dict[str, Any]:
+        return {
+            "id": msg.id,
+            "role": msg.role,
+            "content": msg.content,
+            "timestamp": msg.created_at.isoformat(),
+        }
+
+    @classmethod
+    def add_message(cls, user_id: str, role: str, content: str, session_id: str) -> Dict[str, Any]:
+        with cls._session() as db:
+            msg = ChatMessage(
+                user_id=user_id,
+                role=role,
+                content=content,
+                session_id=session_id
+            )
+            db.add(msg)
+            db.commit()
+            db.refresh(msg)
+            return cls._to_dict(msg)
+
+    @classmethod
+    def page(cls, user_id: str, limit: int = 50, before: Optional[int] = None) -> Dict[str, Any]:
+        """The newest ``limit`` messages older than message ``before``, returned oldest first.
+
+        Keyset pagination on (created_at, id), served by
+        ix_chat_messages_user_created, so every page costs the same however
+        far back it is. ``next_before`` is the id to pass for the page after.
+        """
+        with cls._session() as db:
+            query = db.query(ChatMessage).filter(ChatMessage.user_id == user_id)
+            if before is not None:
+                anchor = db.query(ChatMessage.created_at).filter(
+                    ChatMessage.id == before,
+                    ChatMessage.user_id == user_id
+                ).first()
+                if anchor is None:
+                    # Deleted or someone else's message: nothing older to show
+                    return {"messages": [], "has_more": False, "next_before": None}
+                query = query.filter(or_(
+                    ChatMessage.created_at < anchor.created_at,
+                    and_(ChatMessage.created_at == anchor.created_at, ChatMessage.id < before)
+                ))
+            rows = query.order_by(
+                ChatMessage.created_at.desc(), ChatMessage.id.desc()
+            ).limit(limit + 1).all()
+
+            has_more = len(rows) > limit
+            rows = rows[:limit]
+            return {
+                "messages": [cls._to_dict(msg) for msg in reversed(rows)],
+                "has_more": has_more,
+                "next_before": rows[-1].id if has_more else None,
+            }
+
+    @classmethod
+    def recent_messages(cls, user_id: str, limit: int = 50) -> List[Dict[str, Any]]:
+        """The newest ``limit`` messages, returned oldest first."""
+        return cls.page(user_id, limit)["messages"]
+
+    @classmethod
+    def conversation_history(cls, user_id: str, limit: int = 10) -> List[Dict[str, str]]:
+        """Context for the gateway: the last ``limit`` messages as role/content pairs."""
+        return [
+            {"role": msg["role"], "content": msg["content"]}
+            for msg in cls.recent_messages(user_id, limit)
+        ]
+
+    @classmethod
+    def clear(cls, user_id: str) -> int:
+        with cls._session() as db:
+            deleted = db.query(ChatMessage).filter(ChatMessage.user_id == user_id).delete()
+            db.commit()
+            return deleted
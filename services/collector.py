@@ -1,94 +1,162 @@
 """
 Status collector service - gathers system status from OpenClaw
 """
-import subprocess
 import psutil
 import json
 import os
-import time
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, Iterable, List
 
-from config import OPENCLAW_DIR, WORKSPACE_DIR, STATUS_CACHE_TTL, MINIMAX_API_KEY, MINIMAX_GROUP_ID, MINIMAX_QUOTA_URL, MINIMAX_USAGE_IS_REMAINING
-from services.task_store import TaskStore
+from config import (
+    OPENCLAW_DIR, WORKSPACE_DIR, MINIMAX_API_KEY, MINIMAX_GROUP_ID, MINIMAX_QUOTA_URL, MINIMAX_USAGE_IS_REMAINING,
+    NODE_CONFIG_FILE, OPENCLAW_CONFIG_FILE, MODELS_CONFIG_FILE, SUBAGENT_RUNS_FILE, INTEGRATIONS_FILE,
+    SUBAGENT_RECENT_LIMIT
+)
+from services.config_cache import ConfigCache
+from services.gateway_tracker import GatewayTracker
+from services.http_client import HttpClient
+from services.log_index import LogIndex
+from services.section_cache import SectionCache
+from services.subagent_index import SubagentRunIndex
+from services.task_store import TASKS_FILE, TASKS_JOURNAL_FILE, TaskStore
+from services.system_sampler import SystemSampler
 from services.usage_service import UsageService
 from models import (
     GatewayStatus, SystemHealth, NodeInfo, AgentConfig,
     AgentStatus, ChannelStatus, LogInfo, ProviderInfo, ModelInfo,
     SubAgentRun, MinimaxQuota
 )
-from urllib.request import Request, urlopen
 from urllib.error import URLError
 
+# Sections in payload order; the light set skips log scans, task lists and provider calls.
+STATUS_SECTIONS = ("node", "system", "agents", "channels", "logs", "todos", "minimax", "usage")
+LIGHT_SECTIONS = ("node", "system", "agents", "channels")
+
+# Inputs each cached section is derived from; a change in any of them rebuilds it before its TTL.
+# Sections with no declared deps (system, logs, minimax) are refreshed by TTL only.
+SECTION_DEPS: Dict[str, tuple] = {
+    "node": ("node_config",),
+    "agents": ("models_config", "openclaw_config", "subagent_runs"),
+    "channels": ("openclaw_config",),
+    "todos": ("tasks",),
+    "usage": ("providers", "agents"),
+}
+
+DEP_RESOLVERS: Dict[str, Any] = {
+    "node_config": lambda: ConfigCache.fingerprint(NODE_CONFIG_FILE),
+    "models_config": lambda: ConfigCache.fingerprint(MODELS_CONFIG_FILE),
+    "openclaw_config": lambda: ConfigCache.fingerprint(OPENCLAW_CONFIG_FILE),
+    "subagent_runs": lambda: ConfigCache.fingerprint(SUBAGENT_RUNS_FILE),
+    "tasks": lambda: TaskStore.version(),
+    "providers": lambda: (UsageService.config_generation(), ConfigCache.fingerprint(INTEGRATIONS_FILE)),
+    "agents": lambda: SectionCache.built_at("agents"),
+}
+
+
+# Files behind the dependencies above, for the file watcher.
+WATCHED_FILES: Dict[Path, str] = {
+    NODE_CONFIG_FILE: "node_config",
+    MODELS_CONFIG_FILE: "models_config",
+    OPENCLAW_CONFIG_FILE: "openclaw_config",
+    SUBAGENT_RUNS_FILE: "subagent_runs",
+    TASKS_FILE: "tasks",
+    TASKS_JOURNAL_FILE: "tasks",
+    INTEGRATIONS_FILE: "providers",
+}
+
+
+def sections_depending_on(deps: Iterable[str]) -> List[str]:
+    """Sections that declare any of ``deps``, including ones depending on those sections."""
+    stale: List[str] = []
+    pending = set(deps)
+    while pending:
+        dep = pending.pop()
+        for name, declared in SECTION_DEPS.items():
+            if dep in declared and name not in stale:
+                stale.append(name)
+                pending.add(name)
+    return stale
+
+
+def section_deps_token(name: str) -> tuple:
+    """Current values of everything section ``name`` depends on."""
+    return tuple(DEP_RESOLVERS[dep]() for dep in SECTION_DEPS.get(name, ()))
+
+
+def parse_sections(raw: Optional[str]) -> Optional[List[str]]:
+    """Parse a comma-separated ``sections`` query value; raises ValueError on unknown names."""
+    if not raw:
+        return None
+    requested = [name.strip() for name in raw.split(",") if name.strip()]
+    unknown = [name for name in requested if name not in STATUS_SECTIONS]
+    if unknown:
+        raise ValueError(f"Unknown status sections: {', '.join(unknown)}")
+    return requested
+
 
 class StatusCollector:
     """Collects status information from OpenClaw system"""
-    _status_cache: Optional[Dict[str, Any]] = None
-    _status_cache_ts: float = 0.0
-    _todos_cache: Optional[List[Dict[str, Any]]] = None
-    _todos_cache_ts: float = 0.0
-    _completed_cache: Optional[List[Dict[str, Any]]] = None
-    _completed_cache_ts: float = 0.0
 
     @classmethod
     def invalidate_todos_cache(cls):
-        """Clear todos cache after mutations."""
-        cls._todos_cache = None
-        cls._todos_cache_ts = 0.0
-        cls._completed_cache = None
-        cls._completed_cache_ts = 0.0
-        cls._status_cache = None
-        cls._status_cache_ts = 0.0
+        """Drop the task section after task mutations; other sections stay cached."""
+        SectionCache.invalidate("todos")
 
     def get_gateway_status(self) -> GatewayStatus:
         """Check if Gateway process is running"""
         try:
-            # Find openclaw-gateway process
-            result = subprocess.run(
-                ["pgrep", "-f", "openclaw-gateway"],
-                capture_output=True, text=True
-            )
-            pids = result.stdout.strip().split('\n') if result.stdout.strip() else []
+            proc = GatewayTracker.get_process()
+            if proc is None:
+                return GatewayStatus(running=False)
 
-            if pids and pids[0]:
-                pid = int(pids[0])
-                # Check if process is actually running
-                try:
-                    proc = psutil.Process(pid)
+            try:
+                with proc.oneshot():
                     uptime_seconds = (datetime.now() - datetime.fromtimestamp(proc.create_time()))
                     uptime_str = str(uptime_seconds).split('.')[0]  # Remove microseconds
-                    return GatewayStatus(running=True, pid=pid, uptime=uptime_str)
-                except psutil.NoSuchProcess:
-                    pass
-
-            return GatewayStatus(running=False)
+                    rss = proc.memory_info().rss
+                    cpu = proc.cpu_percent(interval=None)
+                    threads = proc.num_threads()
+                    try:
+                        fds = proc.num_fds()
+                    except (AttributeError, psutil.AccessDenied):
+                        fds = None
+            except psutil.NoSuchProcess:
+                GatewayTracker.invalidate()
+                return GatewayStatus(running=False)
+
+            return GatewayStatus(
+                running=True,
+                pid=proc.pid,
+                uptime=uptime_str,
+                rss_bytes=rss,
+                cpu_percent=cpu,
+                num_threads=threads,
+                num_fds=fds
+            )
         except Exception as e:
             return GatewayStatus(running=False)
 
     def get_system_health(self) -> SystemHealth:
         """Get system resource usage"""
-        cpu = psutil.cpu_percent(interval=0.1)
-        memory = psutil.virtual_memory()
-        disk = psutil.disk_usage('/')
+        sample = SystemSampler.snapshot()
         gateway = self.get_gateway_status()
 
         return SystemHealth(
-            cpu_percent=cpu,
-            memory_percent=memory.percent,
-            disk_usage_percent=disk.percent,
+            cpu_percent=sample["cpu_percent"],
+            memory_percent=sample["memory_percent"],
+            disk_usage_percent=sample["disk_usage_percent"],
+            cpu_avg_1m=sample["cpu_avg_1m"],
+            cpu_avg_5m=sample["cpu_avg_5m"],
             gateway=gateway
         )
 
     def get_node_info(self) -> Optional[NodeInfo]:
         """Read node configuration"""
-        node_file = OPENCLAW_DIR / "node.json"
-        if not node_file.exists():
-            return None
-
         try:
-            with open(node_file) as f:
-                data = json.load(f)
+            data = ConfigCache.load_json(NODE_CONFIG_FILE)
+            if data is None:
+                return None
             return NodeInfo(
                 node_id=data.get("nodeId", ""),
                 display_name=data.get("displayName", ""),
@@ -100,14 +168,11 @@ class StatusCollector:
 
     def get_agent_config(self) -> AgentConfig:
         """Read agent configuration"""
-        models_file = OPENCLAW_DIR / "agents" / "main" / "agent" / "models.json"
         providers = {}
 
-        if models_file.exists():
-            try:
-                with open(models_file) as f:
-                    data = json.load(f)
-
+        try:
+            data = ConfigCache.load_json(MODELS_CONFIG_FILE)
+            if data is not None:
                 for provider_name, provider_data in data.get("providers", {}).items():
                     models = []
                     for model in provider_data.get("models", []):
@@ -122,19 +187,17 @@ class StatusCollector:
                         base_url=provider_data.get("baseUrl", ""),
                         models=models
                     )
-            except Exception:
-                pass
+        except Exception:
+            pass
 
         # Get default model from main config
-        openclaw_file = OPENCLAW_DIR / "openclaw.json"
         default_model = "unknown"
-        if openclaw_file.exists():
-            try:
-                with open(openclaw_file) as f:
-                    data = json.load(f)
+        try:
+            data = ConfigCache.load_json(OPENCLAW_CONFIG_FILE)
+            if data is not None:
                 default_model = data.get("agents", {}).get("defaults", {}).get("model", {}).get("primary", "unknown")
-            except Exception:
-                pass
+        except Exception:
+            pass
 
         return AgentConfig(
             provider=list(providers.keys())[0] if providers else "unknown",
@@ -143,54 +206,32 @@ class StatusCollector:
         )
 
     def get_subagent_runs(self) -> List[SubAgentRun]:
-        """Read subagent run history"""
-        runs_file = OPENCLAW_DIR / "subagents" / "runs.json"
-        runs = []
-
-        if runs_file.exists():
-            try:
-                with open(runs_file) as f:
-                    data = json.load(f)
-
-                for run_id, run_data in data.get("runs", {}).items():
-                    runs.append(SubAgentRun(
-                        run_id=run_id,
-                        agent_name=run_data.get("agentName", ""),
-                        status=run_data.get("status", "unknown"),
-                        start_time=run_data.get("startTime"),
-                        end_time=run_data.get("endTime"),
-                        error=run_data.get("error")
-                    ))
-            except Exception:
-                pass
-
-        return runs
+        """Read subagent run history (newest first)"""
+        return list(SubagentRunIndex.all_runs())
 
     def get_agent_status(self) -> AgentStatus:
-        """Get complete agent status"""
+        """Get complete agent status; runs are trimmed to running + recent ones"""
         config = self.get_agent_config()
-        runs = self.get_subagent_runs()
-        running_count = len([r for r in runs if r.status == "running"])
+        summary = SubagentRunIndex.summary(SUBAGENT_RECENT_LIMIT)
 
         return AgentStatus(
             main_agent=config,
-            subagents_running=running_count,
-            subagent_runs=runs
+            subagents_running=summary["running"],
+            subagent_runs=summary["runs"],
+            subagent_total=summary["total"],
+            subagent_counts=summary["counts"]
         )
 
     def get_channel_status(self) -> ChannelStatus:
         """Read channel configuration"""
-        config_file = OPENCLAW_DIR / "openclaw.json"
         telegram_enabled = False
         telegram_token = None
         telegram_stream = None
         imessage_enabled = False
 
-        if config_file.exists():
-            try:
-                with open(config_file) as f:
-                    data = json.load(f)
-
+        try:
+            data = ConfigCache.load_json(OPENCLAW_CONFIG_FILE)
+            if data is not None:
                 channels = data.get("channels", {})
                 telegram_config = channels.get("telegram", {})
                 telegram_enabled = telegram_config.get("enabled", False)
@@ -198,8 +239,8 @@ class StatusCollector:
                 telegram_stream = telegram_config.get("streamMode")
 
                 imessage_enabled = channels.get("imessage", {}).get("enabled", False)
-            except Exception:
-                pass
+        except Exception:
+            pass
 
         return ChannelStatus(
             telegram={
@@ -221,21 +262,14 @@ class StatusCollector:
                 log_path = log_dir / log_file
                 if log_path.exists():
                     try:
-                        stat = log_path.stat()
-                        # Count error lines
-                        error_count = 0
-                        last_error = None
-                        with open(log_path) as f:
-                            for line in f:
-                                if "error" in line.lower() or "exception" in line.lower():
-                                    error_count += 1
-                                    last_error = line.strip()
+                        indexed = LogIndex.scan(log_path)
+                        last_error = indexed["last_error"]
 
                         logs.append(LogInfo(
                             file=log_file,
-                            size=stat.st_size,
-                            last_modified=datetime.fromtimestamp(stat.st_mtime).isoformat(),
-                            error_count=error_count,
+                            size=indexed["size"],
+                            last_modified=datetime.fromtimestamp(indexed["mtime"]).isoformat(),
+                            error_count=indexed["error_count"],
                             last_error=last_error[:200] if last_error else None
                         ))
                     except Exception:
@@ -258,9 +292,7 @@ class StatusCollector:
         }
 
         try:
-            req = Request(url, headers=headers)
-            with urlopen(req, timeout=5) as resp:
-                payload = json.loads(resp.read().decode("utf-8"))
+            payload = HttpClient.get_json(url, headers=headers, timeout=5)
         except (URLError, ValueError, TimeoutError):
             return None
 
@@ -332,53 +364,88 @@ class StatusCollector:
 
         return MinimaxQuota(total=total, used=used, remaining=remaining, unit=unit)
 
-    def get_full_status(self, light: bool = False) -> Dict[str, Any]:
-        """Get complete dashboard status"""
-        now = time.time()
-        if self._status_cache and (now - self._status_cache_ts) < STATUS_CACHE_TTL:
-            return self._status_cache
-
-        minimax = None if light else self.get_minimax_quota()
-        agents = self.get_agent_status()
-        running_tasks = len([r for r in agents.subagent_runs if r.status == "running"])
-        usage_panels = [] if light else UsageService.get_usage_panels(
-            running_tasks=running_tasks,
-            running_agents=agents.subagents_running
-        )
-        status = {
-            "timestamp": datetime.now().isoformat(),
-            "node": self.get_node_info().dict() if self.get_node_info() else None,
-            "system": self.get_system_health().dict(),
-            "agents": agents.dict(),
-            "channels": self.get_channel_status().dict(),
-            "logs": [] if light else [log.dict() for log in self.get_log_info()],
-            "todos": [] if light else self.get_todos(),
-            "completed_tasks": [] if light else self.get_completed_tasks(),
-            "minimax": minimax.dict() if minimax else None,
-            "usage_panels": usage_panels,
+    def _section_builders(self) -> Dict[str, Any]:
+        return {
+            "node": self._build_node_section,
+            "system": lambda: self.get_system_health().dict(),
+            "agents": lambda: self.get_agent_status().dict(),
+            "channels": lambda: self.get_channel_status().dict(),
+            "logs": lambda: [log.dict() for log in self.get_log_info()],
+            "todos": self._build_todos_section,
+            "minimax": self._build_minimax_section,
+            "usage": self._build_usage_section,
+        }
+
+    def _build_node_section(self) -> Optional[Dict[str, Any]]:
+        node = self.get_node_info()
+        return node.dict() if node else None
+
+    def _build_todos_section(self) -> Dict[str, Any]:
+        return {
+            "todos": TaskStore.list_todos(),
+            "completed_tasks": TaskStore.list_completed(limit=30),
         }
-        self._status_cache = status
-        self._status_cache_ts = now
+
+    def _build_minimax_section(self) -> Optional[Dict[str, Any]]:
+        minimax = self.get_minimax_quota()
+        return minimax.dict() if minimax else None
+
+    def _build_usage_section(self) -> List[Dict[str, Any]]:
+        agents = self.get_section("agents")
+        running = agents.get("subagents_running", 0)
+        return UsageService.get_usage_panels(running_tasks=running, running_agents=running)
+
+    def get_section(self, name: str) -> Any:
+        """Get one status section from the shared section cache."""
+        builders = self._section_builders()
+        deps = None
+        if name in SECTION_DEPS:
+            # Refresh sections this one is derived from first, so its token records the builds it will read.
+            for dep in SECTION_DEPS[name]:
+                if dep in builders:
+                    self.get_section(dep)
+            deps = lambda: section_deps_token(name)
+        return SectionCache.get(name, builders[name], deps=deps)
+
+    def get_full_status(self, light: bool = False, sections: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """Get complete dashboard status.
+
+        ``light`` skips the slow sections (logs, todos, minimax, usage) but keeps
+        their keys empty; ``sections`` returns only the requested sections.
+        """
+        if sections:
+            wanted = [name for name in STATUS_SECTIONS if name in set(sections)]
+            status: Dict[str, Any] = {"timestamp": datetime.now().isoformat()}
+        else:
+            wanted = list(LIGHT_SECTIONS if light else STATUS_SECTIONS)
+            status = {
+                "timestamp": datetime.now().isoformat(),
+                "node": None,
+                "system": None,
+                "agents": None,
+                "channels": None,
+                "logs": [],
+                "todos": [],
+                "completed_tasks": [],
+                "minimax": None,
+                "usage_panels": [],
+            }
+
+        with ConfigCache.scope():
+            for name in wanted:
+                value = self.get_section(name)
+                if name == "todos":
+                    status.update(value)
+                elif name == "usage":
+                    status["usage_panels"] = value
+                else:
+                    status[name] = value
         return status
 
     def get_todos(self) -> List[Dict[str, Any]]:
         """Get pending todos from local store."""
-        now = time.time()
-        if self._todos_cache and (now - self._todos_cache_ts) < max(STATUS_CACHE_TTL, 30):
-            return self._todos_cache
-
-        todos = TaskStore.list_todos()
-        self._todos_cache = todos
-        self._todos_cache_ts = now
-        return todos
+        return self.get_section("todos")["todos"]
 
     def get_completed_tasks(self) -> List[Dict[str, Any]]:
         """Get completed tasks from local store."""
-        now = time.time()
-        if self._completed_cache and (now - self._completed_cache_ts) < max(STATUS_CACHE_TTL, 30):
-            return self._completed_cache
-
-        tasks = TaskStore.list_completed(limit=30)
-        self._completed_cache = tasks
-        self._completed_cache_ts = now
-        return tasks
+        return self.get_section("todos")["completed_tasks"]
@@ -0,0 +1,105 @@
+"""
+Parsed-config cache for the ~/.openclaw JSON files, keyed by (path, mtime_ns, size)
+"""
+import json
+import os
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, Optional, Tuple
+
+Fingerprint = Tuple[int, int]
+
+# Per-build stat memo; see ConfigCache.scope().
+_stat_scope: ContextVar[Optional[Dict[str, Optional[Fingerprint]]]] = ContextVar("config_cache_scope", default=None)
+
+
+def freeze(value: Any) -> Any:
+    """Return a read-only view: dicts become mappingproxies, lists become tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({k: freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+class ConfigCache:
+    """Parses each config file at most once per change and shares immutable views"""
+    _lock = threading.Lock()
+    _entries: Dict[str, Tuple[Fingerprint, Any]] = {}
+    _hits: int = 0
+    _misses: int = 0
+    _stat_calls: int = 0
+
+    @classmethod
+    def fingerprint(cls, path: Path) -> Optional[Fingerprint]:
+        """(mtime_ns, size) of ``path`` or None if missing; stat once per scope."""
+        key = str(path)
+        memo = _stat_scope.get()
+        if memo is not None and key in memo:
+            return memo[key]
+
+        cls._stat_calls += 1
+        try:
+            st = os.stat(key)
+            fp: Optional[Fingerprint] = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            fp = None
+
+        if memo is not None:
+            memo[key] = fp
+        return fp
+
+    @classmethod
+    def load_json(cls, path: Path) -> Optional[Any]:
+        """Frozen parsed JSON for ``path``, or None if the file does not exist.
+
+        Parse errors propagate to the caller and are not cached.
+        """
+        fp = cls.fingerprint(path)
+        if fp is None:
+            return None
+
+        key = str(path)
+        with cls._lock:
+            cached = cls._entries.get(key)
+            if cached and cached[0] == fp:
+                cls._hits += 1
+                return cached[1]
+            cls._misses += 1
+
+        with open(key, "rb") as f:
+            data = freeze(json.load(f))
+
+        with cls._lock:
+            cls._entries[key] = (fp, data)
+        return data
+
+    @classmethod
+    @contextmanager
+    def scope(cls):
+        """Within this block each file is stat'ed at most once (one status build)."""
+        token = _stat_scope.set({})
+        try:
+            yield
+        finally:
+            _stat_scope.reset(token)
+
+    @classmethod
+    def invalidate(cls, path: Optional[Path] = None):
+        with cls._lock:
+            if path is None:
+                cls._entries.clear()
+            else:
+                cls._entries.pop(str(path), None)
+
+    @classmethod
+    def stats(cls) -> Dict[str, Any]:
+        return {
+            "entries": len(cls._entries),
+            "hits": cls._hits,
+            "misses": cls._misses,
+            "stat_calls": cls._stat_calls,
+        }
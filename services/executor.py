@@ -11,6 +11,8 @@ from typing import Optional, Dict, Any, List
 
 from config import OPENCLAW_DIR, WORKSPACE_DIR
 from models import ActionResult, BackupInfo
+from services.gateway_tracker import GatewayTracker
+from services.log_index import LogIndex
 
 
 class OperationExecutor:
@@ -42,6 +44,7 @@ class OperationExecutor:
                 ["openclaw", "gateway", "restart"],
                 capture_output=True, text=True, timeout=30
             )
+            GatewayTracker.invalidate()
 
             if result.returncode == 0:
                 return ActionResult(
@@ -78,6 +81,7 @@ class OperationExecutor:
                 ["pkill", "-f", "openclaw-gateway"],
                 capture_output=True, text=True
             )
+            GatewayTracker.invalidate()
 
             return ActionResult(
                 success=True,
@@ -96,6 +100,7 @@ class OperationExecutor:
                 ["openclaw", "gateway", "start"],
                 capture_output=True, text=True, timeout=30
             )
+            GatewayTracker.invalidate()
 
             if result.returncode == 0:
                 return ActionResult(
@@ -165,6 +170,7 @@ class OperationExecutor:
             for log_file in log_dir.glob("*.log"):
                 with open(log_file, 'w') as f:
                     f.write("")
+                LogIndex.reset(log_file)
 
             return ActionResult(
                 success=True,
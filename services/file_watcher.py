@@ -0,0 +1,237 @@
+"""
+File watcher - reports changes to the ~/.openclaw files the status collector reads
+"""
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+
+from config import WATCH_POLL_INTERVAL
+
+# inotify(7) constants
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+
+# Files are usually replaced via rename, so the parent directory is watched rather than the file.
+_DIR_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF
+_EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, name length
+
+OnChange = Callable[[Set[str]], None]
+
+
+class _Inotify:
+    """Minimal ctypes binding to the Linux inotify API"""
+
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._rm_watch = libc.inotify_rm_watch
+        self._rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.fd = fd
+
+    def add_watch(self, path: str, mask: int) -> int:
+        wd = self._add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {path}")
+        return wd
+
+    def rm_watch(self, wd: int):
+        self._rm_watch(self.fd, wd)
+
+    def read_events(self):
+        """Yield (wd, mask, name) for everything queued; never blocks."""
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return
+        pos = 0
+        while pos + _EVENT_HEADER.size <= len(data):
+            wd, mask, _, length = _EVENT_HEADER.unpack_from(data, pos)
+            pos += _EVENT_HEADER.size
+            name = data[pos:pos + length].rstrip(b"\0").decode("utf-8", "replace")
+            pos += length
+            yield wd, mask, name
+
+    def close(self):
+        os.close(self.fd)
+
+
+class FileWatcher:
+    """Watches a fixed set of files and reports the tags of the ones that changed.
+
+    Uses inotify on Linux. Files whose directory cannot be watched (missing
+    directory, other platforms, inotify limits) are stat-polled every
+    WATCH_POLL_INTERVAL seconds instead. Callbacks run on the watcher thread.
+    """
+    _lock = threading.Lock()
+    _thread: Optional[threading.Thread] = None
+    _stop = threading.Event()
+    _files: Dict[str, str] = {}  # absolute path -> tag
+    _on_change: Optional[OnChange] = None
+    _inotify: Optional[_Inotify] = None
+    _watches: Dict[int, str] = {}  # wd -> directory
+    _dir_files: Dict[str, Dict[str, str]] = {}  # directory -> {file name -> tag}
+    _polled: Dict[str, Optional[Tuple[int, int]]] = {}  # path -> last (mtime_ns, size)
+    _events: int = 0
+    _notifications: int = 0
+    _last_change_at: Optional[float] = None
+
+    @classmethod
+    def start(cls, files: Dict[Path, str], on_change: OnChange):
+        """Start watching ``files`` (path -> tag); ``on_change`` receives the set of changed tags."""
+        with cls._lock:
+            if cls._thread and cls._thread.is_alive():
+                return
+            cls._stop.clear()
+            cls._files = {str(path): tag for path, tag in files.items()}
+            cls._on_change = on_change
+            cls._watches = {}
+            cls._dir_files = {}
+            cls._polled = {}
+            cls._inotify = None
+            if sys.platform.startswith("linux"):
+                try:
+                    cls._inotify = _Inotify()
+                except (OSError, AttributeError) as e:
+                    print(f"inotify unavailable, polling config files instead: {e}")
+            for path in cls._files:
+                cls._track(path)
+            cls._thread = threading.Thread(target=cls._run, name="file-watcher", daemon=True)
+            cls._thread.start()
+
+    @classmethod
+    def stop(cls):
+        cls._stop.set()
+
+    @staticmethod
+    def _stat(path: str) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(path)
+            return st.st_mtime_ns, st.st_size
+        except OSError:
+            return None
+
+    @classmethod
+    def _track(cls, path: str):
+        """Watch the file's directory with inotify if possible, else fall back to polling it."""
+        directory, name = os.path.split(path)
+        if cls._inotify is not None and os.path.isdir(directory):
+            if directory not in cls._dir_files:
+                try:
+                    wd = cls._inotify.add_watch(directory, _DIR_MASK)
+                    cls._watches[wd] = directory
+                    cls._dir_files[directory] = {}
+                except OSError:
+                    pass
+            if directory in cls._dir_files:
+                cls._dir_files[directory][name] = cls._files[path]
+                cls._polled.pop(path, None)
+                return
+        cls._polled.setdefault(path, cls._stat(path))
+
+    @classmethod
+    def _drop_dir(cls, directory: str):
+        """The directory went away; poll its files until it comes back."""
+        for name in cls._dir_files.pop(directory, {}):
+            path = os.path.join(directory, name)
+            cls._polled[path] = cls._stat(path)
+
+    @classmethod
+    def _read_inotify(cls) -> Set[str]:
+        changed: Set[str] = set()
+        for wd, mask, name in cls._inotify.read_events():
+            cls._events += 1
+            if mask & IN_Q_OVERFLOW:
+                changed.update(cls._files.values())  # events were lost; assume everything changed
+                continue
+            directory = cls._watches.get(wd)
+            if directory is None:
+                continue
+            if mask & (IN_IGNORED | IN_DELETE_SELF | IN_MOVE_SELF):
+                cls._watches.pop(wd, None)
+                if not mask & IN_IGNORED:
+                    cls._inotify.rm_watch(wd)
+                changed.update(cls._dir_files.get(directory, {}).values())
+                cls._drop_dir(directory)
+                continue
+            tag = cls._dir_files.get(directory, {}).get(name)
+            if tag:
+                changed.add(tag)
+        return changed
+
+    @classmethod
+    def _poll(cls) -> Set[str]:
+        changed: Set[str] = set()
+        for path, previous in list(cls._polled.items()):
+            current = cls._stat(path)
+            if current != previous:
+                cls._polled[path] = current
+                changed.add(cls._files[path])
+            if cls._inotify is not None and os.path.isdir(os.path.dirname(path)):
+                cls._track(path)  # directory appeared; switch this file to inotify
+        return changed
+
+    @classmethod
+    def _run(cls):
+        next_poll = time.monotonic() + WATCH_POLL_INTERVAL
+        while not cls._stop.is_set():
+            changed: Set[str] = set()
+            timeout = max(next_poll - time.monotonic(), 0)
+            if cls._inotify is not None:
+                try:
+                    ready, _, _ = select.select([cls._inotify.fd], [], [], timeout)
+                except (OSError, ValueError):
+                    ready = []
+                if ready:
+                    changed |= cls._read_inotify()
+            else:
+                cls._stop.wait(timeout)
+
+            if time.monotonic() >= next_poll:
+                changed |= cls._poll()
+                next_poll = time.monotonic() + WATCH_POLL_INTERVAL
+
+            if changed and cls._on_change is not None:
+                cls._notifications += 1
+                cls._last_change_at = time.time()
+                try:
+                    cls._on_change(changed)
+                except Exception as e:
+                    print(f"File watcher callback error: {e}")
+
+        if cls._inotify is not None:
+            cls._inotify.close()
+            cls._inotify = None
+
+    @classmethod
+    def stats(cls) -> Dict[str, Any]:
+        return {
+            "running": bool(cls._thread and cls._thread.is_alive()),
+            "backend": "inotify" if cls._inotify is not None else "poll",
+            "watched_dirs": sorted(cls._dir_files),
+            "polled_files": sorted(cls._polled),
+            "events": cls._events,
+            "notifications": cls._notifications,
+            "last_change_at": datetime.fromtimestamp(cls._last_change_at).isoformat() if cls._last_change_at else None,
+        }
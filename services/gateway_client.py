@@ -0,0 +1,317 @@
+"""
+Gateway client - long-lived, multiplexed WebSocket connections to the OpenClaw Gateway
+"""
+import asyncio
+import json
+import time
+import uuid
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional
+
+import websockets
+
+from config import (
+    GATEWAY_URL, GATEWAY_POOL_SIZE, GATEWAY_MAX_IN_FLIGHT, GATEWAY_ACQUIRE_TIMEOUT,
+    GATEWAY_REQUEST_TIMEOUT, GATEWAY_RECONNECT_MAX_DELAY
+)
+
+
+# Frames of these types carry part of a reply; any other frame ends the request.
+STREAM_CHUNK_TYPES = ("delta", "chunk", "token", "stream")
+
+
+class GatewayUnavailable(Exception):
+    """No gateway connection could take the request"""
+
+
+def is_final_frame(data: Dict[str, Any]) -> bool:
+    if data.get("done") or data.get("final"):
+        return True
+    return data.get("type") not in STREAM_CHUNK_TYPES
+
+
+def frame_text(data: Dict[str, Any]) -> str:
+    """The text a reply frame carries, whichever field the gateway put it in."""
+    for key in ("delta", "text", "content"):
+        value = data.get(key)
+        if isinstance(value, str):
+            return value
+    return ""
+
+
+class _GatewayConnection:
+    """One socket plus its reader task; reply frames are routed to callers by correlation id"""
+
+    def __init__(self, client: "GatewayClient", index: int):
+        self.client = client
+        self.index = index
+        self.ws = None
+        self.connected = asyncio.Event()
+        self.pending: Dict[str, asyncio.Queue] = {}
+        self.order: Deque[str] = deque()  # ids in send order, for replies that carry no id
+        self.reconnects = 0
+        self.last_error: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self.ws is not None:
+            try:
+                await self.ws.close()
+            except Exception:
+                pass
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._fail_pending(GatewayUnavailable("gateway client stopped"))
+
+    @property
+    def in_flight(self) -> int:
+        return len(self.pending)
+
+    async def _run(self):
+        delay = 1.0
+        while True:
+            try:
+                # No keepalive pings: a long streamed reply can hold up the pong, and
+                # a ping timeout would drop every request multiplexed on this socket.
+                async with websockets.connect(f"{self.client.url}/ws", open_timeout=10, ping_interval=None) as ws:
+                    self.ws = ws
+                    self.connected.set()
+                    self.client._wake_waiters()
+                    delay = 1.0
+                    async for raw in ws:
+                        self._dispatch(raw)
+                self.last_error = "connection closed by gateway"
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.last_error = str(e) or e.__class__.__name__
+            finally:
+                self.ws = None
+                self.connected.clear()
+                self._fail_pending(GatewayUnavailable(f"gateway connection lost: {self.last_error}"))
+
+            self.reconnects += 1
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, GATEWAY_RECONNECT_MAX_DELAY)
+
+    def _dispatch(self, raw: Any):
+        try:
+            data = json.loads(raw)
+        except (TypeError, ValueError):
+            return
+        if not isinstance(data, dict):
+            return
+
+        request_id = data.get("id") or data.get("requestId") or data.get("correlationId")
+        if request_id is None:
+            # Gateways that do not echo ids reply in order; hand the frame to the oldest request.
+            request_id = self.order[0] if self.order else None
+        queue = self.pending.get(request_id) if request_id else None
+        if queue is None:
+            return
+        if is_final_frame(data):
+            self.forget(request_id)
+        queue.put_nowait(data)
+
+    def _fail_pending(self, error: Exception):
+        pending, self.pending = self.pending, {}
+        self.order.clear()
+        for queue in pending.values():
+            queue.put_nowait(error)
+        self.client._wake_waiters()
+
+    async def send(self, request_id: str, payload: Dict[str, Any]) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue()
+        self.pending[request_id] = queue
+        self.order.append(request_id)
+        try:
+            await self.ws.send(json.dumps(payload, ensure_ascii=False))
+        except Exception as e:
+            self.forget(request_id)
+            raise GatewayUnavailable(f"gateway send failed: {e}")
+        return queue
+
+    def forget(self, request_id: str):
+        """Stop tracking ``request_id`` (answered, timed out or cancelled) and free its slot."""
+        if self.pending.pop(request_id, None) is None:
+            return
+        try:
+            self.order.remove(request_id)
+        except ValueError:
+            pass
+        self.client._wake_waiters()
+
+
+class GatewayClient:
+    """Pool of persistent gateway sockets shared by every chat user.
+
+    Requests carry an ``id`` and are spread over the least-loaded connected
+    socket. At most GATEWAY_MAX_IN_FLIGHT requests per socket are outstanding;
+    further callers queue for a free slot for up to GATEWAY_ACQUIRE_TIMEOUT,
+    which keeps a slow gateway from being flooded.
+    """
+
+    def __init__(self, url: str = GATEWAY_URL, pool_size: int = GATEWAY_POOL_SIZE):
+        self.url = url
+        self.pool_size = max(pool_size, 1)
+        self._connections: List[_GatewayConnection] = []
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._requests = 0
+        self._errors = 0
+        self._timeouts = 0
+        self._rejected = 0
+        self._cancelled = 0
+        self._latency_ms: Deque[float] = deque(maxlen=200)
+
+    @property
+    def started(self) -> bool:
+        return bool(self._connections)
+
+    async def start(self):
+        """Open the pool (called from the app lifespan); sockets connect in the background."""
+        if self._connections:
+            return
+        self._connections = [_GatewayConnection(self, i) for i in range(self.pool_size)]
+        for connection in self._connections:
+            connection.start()
+
+    async def stop(self):
+        connections, self._connections = self._connections, []
+        for connection in connections:
+            await connection.stop()
+
+    def _pick(self) -> Optional[_GatewayConnection]:
+        live = [c for c in self._connections if c.ws is not None and c.in_flight < GATEWAY_MAX_IN_FLIGHT]
+        return min(live, key=lambda c: c.in_flight) if live else None
+
+    def _wake_waiters(self):
+        """A slot freed up or a socket connected; let queued callers try again."""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+
+    async def _acquire(self) -> _GatewayConnection:
+        """The least-loaded socket with a free slot, waiting up to GATEWAY_ACQUIRE_TIMEOUT for one."""
+        deadline = time.monotonic() + GATEWAY_ACQUIRE_TIMEOUT
+        while True:
+            connection = self._pick()
+            if connection is not None:
+                return connection
+            if not any(c.ws is not None for c in self._connections):
+                # Nothing connected: fail fast so the caller can fall back.
+                raise GatewayUnavailable("no gateway connection available")
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self._rejected += 1
+                raise GatewayUnavailable("gateway is busy, too many requests in flight")
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await asyncio.wait_for(waiter, timeout=remaining)
+            except asyncio.TimeoutError:
+                pass
+
+    async def stream(self, payload: Dict[str, Any], timeout: float = GATEWAY_REQUEST_TIMEOUT) -> AsyncIterator[Dict[str, Any]]:
+        """Send ``payload`` and yield the gateway's reply frames as they arrive.
+
+        Chunk frames (STREAM_CHUNK_TYPES) are yielded until a final frame, which
+        is yielded last. ``timeout`` applies to the gap between frames. Closing
+        the iterator early sends the gateway a ``cancel`` for the request.
+
+        Raises GatewayUnavailable when no socket is connected or the pool stays
+        saturated, and asyncio.TimeoutError when the next frame does not arrive in time.
+        """
+        if not self._connections:
+            raise GatewayUnavailable("gateway client not started")
+
+        try:
+            connection = await self._acquire()
+            request_id = uuid.uuid4().hex
+            started = time.perf_counter()
+            self._requests += 1
+            queue = await connection.send(request_id, dict(payload, id=request_id))
+            finished = False
+            try:
+                while not finished:
+                    try:
+                        frame = await asyncio.wait_for(queue.get(), timeout=timeout)
+                    except asyncio.TimeoutError:
+                        self._timeouts += 1
+                        raise
+                    if isinstance(frame, Exception):
+                        raise frame
+                    if started is not None:
+                        # Latency is time to first frame, which is what the user waits on.
+                        self._latency_ms.append((time.perf_counter() - started) * 1000)
+                        started = None
+                    finished = is_final_frame(frame)
+                    yield frame
+            finally:
+                if not finished and request_id in connection.pending:
+                    connection.forget(request_id)
+                    await self._cancel(connection, request_id)
+        except GatewayUnavailable:
+            self._errors += 1
+            raise
+
+    async def _cancel(self, connection: _GatewayConnection, request_id: str):
+        self._cancelled += 1
+        if connection.ws is None:
+            return
+        try:
+            await connection.ws.send(json.dumps({"type": "cancel", "id": request_id}))
+        except Exception:
+            pass
+
+    async def request(self, payload: Dict[str, Any], timeout: float = GATEWAY_REQUEST_TIMEOUT) -> Dict[str, Any]:
+        """Send ``payload`` and return the final reply frame, with streamed chunks joined into ``text``."""
+        parts: List[str] = []
+        reply: Dict[str, Any] = {}
+        async for frame in self.stream(payload, timeout):
+            if is_final_frame(frame):
+                reply = frame
+            else:
+                parts.append(frame_text(frame))
+        if parts and not (reply.get("text") or reply.get("content")):
+            reply = dict(reply, text="".join(parts))
+        return reply
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool health for diagnostics."""
+        latencies = sorted(self._latency_ms)
+        return {
+            "url": self.url,
+            "pool_size": self.pool_size,
+            "connected": sum(1 for c in self._connections if c.ws is not None),
+            "in_flight": sum(c.in_flight for c in self._connections),
+            "waiting": sum(1 for w in self._waiters if not w.done()),
+            "requests": self._requests,
+            "errors": self._errors,
+            "timeouts": self._timeouts,
+            "rejected": self._rejected,
+            "cancelled": self._cancelled,
+            "avg_latency_ms": round(sum(latencies) / len(latencies), 3) if latencies else None,
+            "p95_latency_ms": round(latencies[min(int(len(latencies) * 0.95), len(latencies) - 1)], 3) if latencies else None,
+            "connections": [
+                {
+                    "index": c.index,
+                    "connected": c.ws is not None,
+                    "in_flight": c.in_flight,
+                    "reconnects": c.reconnects,
+                    "last_error": c.last_error,
+                }
+                for c in self._connections
+            ],
+        }
+
+
+# Global gateway client instance, opened and closed by the app lifespan
+gateway_client = GatewayClient()
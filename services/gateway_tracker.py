@@ -0,0 +1,83 @@
+"""
+Gateway process tracker - finds openclaw-gateway once and keeps following its PID
+"""
+import os
+import threading
+import time
+from typing import Optional
+
+import psutil
+
+from config import GATEWAY_PROCESS_MATCH, GATEWAY_RESCAN_INTERVAL
+
+
+class GatewayTracker:
+    """Caches the gateway psutil.Process, rescanning only when it is gone or the PID was reused"""
+    _lock = threading.Lock()
+    _proc: Optional[psutil.Process] = None
+    _create_time: Optional[float] = None
+    _last_scan: float = 0.0
+    _scans: int = 0
+
+    @classmethod
+    def _is_alive(cls) -> bool:
+        proc = cls._proc
+        if proc is None:
+            return False
+        try:
+            # A reused PID reports a different create_time.
+            return proc.is_running() and proc.create_time() == cls._create_time
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            return False
+
+    @classmethod
+    def _scan(cls) -> Optional[psutil.Process]:
+        """Walk the process table the way ``pgrep -f`` matches the full command line."""
+        cls._scans += 1
+        cls._last_scan = time.monotonic()
+        own_pid = os.getpid()
+        for proc in psutil.process_iter(["pid", "name", "cmdline"]):
+            info = proc.info
+            if info["pid"] == own_pid:
+                continue
+            cmdline = " ".join(info.get("cmdline") or []) or (info.get("name") or "")
+            if GATEWAY_PROCESS_MATCH in cmdline:
+                return proc
+        return None
+
+    @classmethod
+    def get_process(cls, force: bool = False) -> Optional[psutil.Process]:
+        """Return the tracked gateway process, or None if it is not running."""
+        with cls._lock:
+            if not force and cls._is_alive():
+                return cls._proc
+
+            # While the gateway is down, avoid walking the process table on every call.
+            if (not force and cls._proc is None
+                    and time.monotonic() - cls._last_scan < GATEWAY_RESCAN_INTERVAL):
+                return None
+
+            cls._proc = None
+            cls._create_time = None
+            try:
+                proc = cls._scan()
+                if proc is not None:
+                    cls._create_time = proc.create_time()
+                    # First call primes per-process CPU accounting.
+                    proc.cpu_percent(interval=None)
+                    cls._proc = proc
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                cls._proc = None
+            return cls._proc
+
+    @classmethod
+    def invalidate(cls):
+        """Forget the tracked process so the next call rescans (after start/stop actions)."""
+        with cls._lock:
+            cls._proc = None
+            cls._create_time = None
+            cls._last_scan = 0.0
+
+    @classmethod
+    def scan_count(cls) -> int:
+        return cls._scans
@@ -0,0 +1,255 @@
+"""
+Shared HTTP client - pooled keep-alive connections for provider quota/usage calls
+"""
+import gzip
+import http.client
+import io
+import json
+import socket
+import ssl
+import threading
+import time
+import zlib
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlsplit
+from urllib.request import Request, getproxies, proxy_bypass, urlopen
+
+from config import HTTP_POOL_MAX_PER_HOST, HTTP_POOL_IDLE_SECONDS
+
+PoolKey = Tuple[str, str, int]
+
+# Errors that mean a pooled keep-alive socket was closed by the server while idle.
+_STALE_SOCKET_ERRORS = (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError)
+
+
+class _TimedConnection(http.client.HTTPConnection):
+    """HTTP/1.1 connection that records DNS, TCP connect and TLS handshake times"""
+
+    def __init__(self, host: str, port: int, timeout: float, tls_context: Optional[ssl.SSLContext] = None):
+        super().__init__(host, port, timeout=timeout)
+        self._tls_context = tls_context
+        self.timings: Dict[str, Optional[float]] = {}
+        self.idle_since = 0.0
+
+    def connect(self):
+        started = time.perf_counter()
+        infos = socket.getaddrinfo(self.host, self.port, 0, socket.SOCK_STREAM)
+        resolved = time.perf_counter()
+
+        sock = None
+        last_err: Optional[OSError] = None
+        for family, socktype, proto, _, addr in infos:
+            try:
+                sock = socket.socket(family, socktype, proto)
+                sock.settimeout(self.timeout)
+                sock.connect(addr)
+                break
+            except OSError as e:
+                last_err = e
+                if sock is not None:
+                    sock.close()
+                    sock = None
+        if sock is None:
+            raise last_err or OSError(f"could not connect to {self.host}:{self.port}")
+        connected = time.perf_counter()
+
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        if self._tls_context is not None:
+            sock = self._tls_context.wrap_socket(sock, server_hostname=self.host)
+        handshaken = time.perf_counter()
+
+        self.sock = sock
+        self.timings = {
+            "dns_ms": round((resolved - started) * 1000, 3),
+            "connect_ms": round((connected - resolved) * 1000, 3),
+            "tls_ms": round((handshaken - connected) * 1000, 3) if self._tls_context is not None else None,
+        }
+
+
+class HttpClient:
+    """Process-wide HTTP/1.1 client with per-host keep-alive pools and concurrency limits.
+
+    Speaks HTTP/1.1 only (the standard library has no HTTP/2). Requests that
+    must go through an environment proxy fall back to plain urlopen.
+    """
+    _lock = threading.Lock()
+    _idle: Dict[PoolKey, Deque[_TimedConnection]] = {}
+    _limits: Dict[PoolKey, threading.BoundedSemaphore] = {}
+    _host_stats: Dict[str, Dict[str, Any]] = {}
+    _recent: Deque[Dict[str, Any]] = deque(maxlen=50)
+    _tls_context = ssl.create_default_context()
+    _proxies: Optional[Dict[str, str]] = None
+
+    @classmethod
+    def get_json(cls, url: str, headers: Optional[Dict[str, str]] = None, timeout: float = 6) -> Any:
+        return json.loads(cls.request("GET", url, headers=headers, timeout=timeout).decode("utf-8"))
+
+    @classmethod
+    def request(cls, method: str, url: str, headers: Optional[Dict[str, str]] = None,
+                body: Optional[bytes] = None, timeout: float = 6) -> bytes:
+        """Perform a request and return the decoded body.
+
+        Raises urllib's HTTPError for 4xx/5xx and URLError for transport
+        failures, so callers written against urlopen keep working.
+        """
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        if scheme not in ("http", "https") or not parts.hostname:
+            raise URLError(f"unsupported url: {url}")
+        if cls._proxy_for(scheme, parts.hostname):
+            return cls._request_via_proxy(method, url, headers, body, timeout)
+
+        port = parts.port or (443 if scheme == "https" else 80)
+        key: PoolKey = (scheme, parts.hostname, port)
+        target = parts.path or "/"
+        if parts.query:
+            target += f"?{parts.query}"
+        send_headers = {"Accept-Encoding": "gzip, deflate", "Connection": "keep-alive"}
+        send_headers.update(headers or {})
+
+        limiter = cls._limiter(key)
+        if not limiter.acquire(timeout=timeout):
+            raise URLError(f"too many concurrent requests to {parts.hostname}")
+        try:
+            for attempt in range(2):
+                conn, reused = cls._checkout(key, timeout)
+                started = time.perf_counter()
+                try:
+                    conn.request(method, target, body=body, headers=send_headers)
+                    resp = conn.getresponse()
+                    first_byte = time.perf_counter()
+                    raw = resp.read()
+                except _STALE_SOCKET_ERRORS as e:
+                    conn.close()
+                    if reused and attempt == 0:
+                        continue  # idle socket went away; retry once on a fresh connection
+                    cls._record(key, conn, reused, started, None, error=True)
+                    raise URLError(e)
+                except (OSError, http.client.HTTPException) as e:
+                    conn.close()
+                    cls._record(key, conn, reused, started, None, error=True)
+                    raise URLError(e)
+
+                cls._record(key, conn, reused, started, first_byte)
+                if resp.will_close:
+                    conn.close()
+                else:
+                    cls._checkin(key, conn)
+
+                data = cls._decode(raw, resp.getheader("Content-Encoding"))
+                if resp.status >= 400:
+                    raise HTTPError(url, resp.status, resp.reason, resp.headers, io.BytesIO(data))
+                return data
+            raise URLError("connection closed by server")
+        finally:
+            limiter.release()
+
+    @classmethod
+    def _limiter(cls, key: PoolKey) -> threading.BoundedSemaphore:
+        with cls._lock:
+            limiter = cls._limits.get(key)
+            if limiter is None:
+                limiter = threading.BoundedSemaphore(HTTP_POOL_MAX_PER_HOST)
+                cls._limits[key] = limiter
+            return limiter
+
+    @classmethod
+    def _checkout(cls, key: PoolKey, timeout: float) -> Tuple[_TimedConnection, bool]:
+        now = time.monotonic()
+        with cls._lock:
+            idle = cls._idle.get(key)
+            while idle:
+                conn = idle.pop()
+                if now - conn.idle_since < HTTP_POOL_IDLE_SECONDS and conn.sock is not None:
+                    conn.timeout = timeout
+                    conn.sock.settimeout(timeout)
+                    conn.timings = {}
+                    return conn, True
+                conn.close()
+
+        scheme, host, port = key
+        tls = cls._tls_context if scheme == "https" else None
+        return _TimedConnection(host, port, timeout, tls), False
+
+    @classmethod
+    def _checkin(cls, key: PoolKey, conn: _TimedConnection):
+        conn.idle_since = time.monotonic()
+        with cls._lock:
+            idle = cls._idle.setdefault(key, deque())
+            if len(idle) < HTTP_POOL_MAX_PER_HOST:
+                idle.append(conn)
+                return
+        conn.close()
+
+    @staticmethod
+    def _decode(raw: bytes, encoding: Optional[str]) -> bytes:
+        """Undo Content-Encoding; a corrupt body is a transport failure (URLError) like any other."""
+        encoding = (encoding or "").lower()
+        try:
+            if encoding == "gzip":
+                return gzip.decompress(raw)
+            if encoding == "deflate":
+                try:
+                    return zlib.decompress(raw)
+                except zlib.error:
+                    return zlib.decompress(raw, -zlib.MAX_WBITS)
+        except (OSError, EOFError, zlib.error) as e:
+            raise URLError(f"could not decode {encoding} response body: {e}")
+        return raw
+
+    @classmethod
+    def _proxy_for(cls, scheme: str, host: str) -> bool:
+        if cls._proxies is None:
+            cls._proxies = getproxies()
+        return bool(cls._proxies.get(scheme)) and not proxy_bypass(host)
+
+    @classmethod
+    def _request_via_proxy(cls, method: str, url: str, headers: Optional[Dict[str, str]],
+                           body: Optional[bytes], timeout: float) -> bytes:
+        req = Request(url, data=body, headers=headers or {}, method=method)
+        with urlopen(req, timeout=timeout) as resp:
+            return resp.read()
+
+    @classmethod
+    def _record(cls, key: PoolKey, conn: _TimedConnection, reused: bool, started: float,
+                first_byte: Optional[float], error: bool = False):
+        finished = time.perf_counter()
+        host = f"{key[1]}:{key[2]}"
+        timings = conn.timings or {}
+        call = {
+            "host": host,
+            "reused": reused,
+            "error": error,
+            "dns_ms": timings.get("dns_ms"),
+            "connect_ms": timings.get("connect_ms"),
+            "tls_ms": timings.get("tls_ms"),
+            "ttfb_ms": round((first_byte - started) * 1000, 3) if first_byte else None,
+            "total_ms": round((finished - started) * 1000, 3),
+            "at": time.time(),
+        }
+        with cls._lock:
+            cls._recent.append(call)
+            stats = cls._host_stats.setdefault(host, {
+                "requests": 0, "errors": 0, "new_connections": 0, "reused_connections": 0, "total_ms_sum": 0.0,
+            })
+            stats["requests"] += 1
+            stats["errors"] += int(error)
+            stats["reused_connections" if reused else "new_connections"] += 1
+            stats["total_ms_sum"] += call["total_ms"]
+            stats["last"] = call
+
+    @classmethod
+    def stats(cls) -> Dict[str, Any]:
+        """Per-host counters plus the most recent per-call timings."""
+        with cls._lock:
+            hosts = {}
+            for host, stats in cls._host_stats.items():
+                item = {k: v for k, v in stats.items() if k != "total_ms_sum"}
+                item["avg_total_ms"] = round(stats["total_ms_sum"] / stats["requests"], 3) if stats["requests"] else None
+                item["idle_connections"] = sum(
+                    len(conns) for key, conns in cls._idle.items() if f"{key[1]}:{key[2]}" == host
+                )
+                hosts[host] = item
+            return {"hosts": hosts, "recent": list(cls._recent)}
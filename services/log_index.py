@@ -0,0 +1,115 @@
+"""
+Incremental log error index - only scans bytes appended since the last call
+"""
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from config import LOG_INDEX_FILE
+
+CHUNK_SIZE = 1024 * 1024
+
+
+class LogIndex:
+    """Per-file offset index keeping error_count/last_error, persisted across restarts"""
+    _lock = threading.Lock()
+    _entries: Optional[Dict[str, Dict[str, Any]]] = None
+
+    @classmethod
+    def _load_entries(cls) -> Dict[str, Dict[str, Any]]:
+        if cls._entries is None:
+            try:
+                data = json.loads(LOG_INDEX_FILE.read_text())
+                cls._entries = data if isinstance(data, dict) else {}
+            except Exception:
+                cls._entries = {}
+        return cls._entries
+
+    @classmethod
+    def _persist(cls):
+        try:
+            LOG_INDEX_FILE.parent.mkdir(parents=True, exist_ok=True)
+            tmp = LOG_INDEX_FILE.with_suffix(".tmp")
+            tmp.write_text(json.dumps(cls._entries, ensure_ascii=False))
+            os.replace(tmp, LOG_INDEX_FILE)
+        except Exception:
+            pass
+
+    @staticmethod
+    def _fresh_entry(stat: os.stat_result) -> Dict[str, Any]:
+        return {
+            "dev": stat.st_dev,
+            "ino": stat.st_ino,
+            "offset": 0,
+            "error_count": 0,
+            "last_error": None,
+        }
+
+    @classmethod
+    def _scan_from(cls, path: Path, entry: Dict[str, Any]):
+        """Read complete lines after ``entry['offset']`` and fold them into the counters."""
+        offset = entry["offset"]
+        error_count = entry["error_count"]
+        last_error = entry["last_error"]
+        leftover = b""
+
+        with open(path, "rb") as f:
+            f.seek(offset)
+            while True:
+                chunk = f.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                lines = (leftover + chunk).split(b"\n")
+                # The last piece has no newline yet; re-read it next time.
+                leftover = lines.pop()
+                for line in lines:
+                    offset += len(line) + 1
+                    low = line.lower()
+                    if b"error" in low or b"exception" in low:
+                        error_count += 1
+                        last_error = line.strip()[:400].decode("utf-8", errors="replace")
+
+        entry["offset"] = offset
+        entry["error_count"] = error_count
+        entry["last_error"] = last_error
+
+    @classmethod
+    def scan(cls, path: Path) -> Dict[str, Any]:
+        """Bring the index for ``path`` up to date and return its counters."""
+        stat = path.stat()
+        key = str(path)
+        with cls._lock:
+            entries = cls._load_entries()
+            entry = entries.get(key)
+
+            rotated = entry is None or entry.get("ino") != stat.st_ino or entry.get("dev") != stat.st_dev
+            truncated = entry is not None and stat.st_size < entry.get("offset", 0)
+            if rotated or truncated:
+                entry = cls._fresh_entry(stat)
+                entries[key] = entry
+
+            before = entry["offset"]
+            if stat.st_size > before:
+                cls._scan_from(path, entry)
+            if rotated or truncated or entry["offset"] != before:
+                cls._persist()
+
+            return {
+                "size": stat.st_size,
+                "mtime": stat.st_mtime,
+                "error_count": entry["error_count"],
+                "last_error": entry["last_error"],
+            }
+
+    @classmethod
+    def reset(cls, path: Optional[Path] = None):
+        """Drop indexed state for one file (or all) after it was cleared in place."""
+        with cls._lock:
+            entries = cls._load_entries()
+            if path is None:
+                entries.clear()
+            else:
+                entries.pop(str(path), None)
+            cls._persist()
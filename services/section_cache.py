@@ -0,0 +1,70 @@
+"""
+Status section cache - each dashboard section is built and expired independently
+"""
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from config import STATUS_SECTION_TTLS, STATUS_CACHE_TTL
+
+
+DepsFn = Callable[[], Any]
+
+
+class SectionCache:
+    """Per-section cache shared by every StatusCollector instance.
+
+    An entry is reused while it is younger than its TTL and, when the caller
+    passes ``deps``, while the dependency token it was built with still matches.
+    """
+    _lock = threading.Lock()
+    _entries: Dict[str, Tuple[float, Any, Any]] = {}  # name -> (built_at, deps token, value)
+    _build_locks: Dict[str, threading.Lock] = {}
+
+    @classmethod
+    def ttl(cls, name: str) -> float:
+        return STATUS_SECTION_TTLS.get(name, STATUS_CACHE_TTL)
+
+    @classmethod
+    def _peek(cls, name: str, now: float, token: Any) -> Tuple[bool, Any]:
+        with cls._lock:
+            entry = cls._entries.get(name)
+        if entry and (now - entry[0]) < cls.ttl(name) and entry[1] == token:
+            return True, entry[2]
+        return False, None
+
+    @classmethod
+    def get(cls, name: str, builder: Callable[[], Any], deps: Optional[DepsFn] = None) -> Any:
+        """Cached value of ``name``, rebuilding it (once across threads) when expired or its deps changed."""
+        token = deps() if deps is not None else None
+        hit, value = cls._peek(name, time.time(), token)
+        if hit:
+            return value
+
+        with cls._lock:
+            build_lock = cls._build_locks.setdefault(name, threading.Lock())
+        with build_lock:
+            # Another thread may have rebuilt it while we waited.
+            hit, value = cls._peek(name, time.time(), token)
+            if hit:
+                return value
+            value = builder()
+            with cls._lock:
+                cls._entries[name] = (time.time(), token, value)
+            return value
+
+    @classmethod
+    def invalidate(cls, *names: str):
+        """Drop the given sections, or every section when called without names."""
+        with cls._lock:
+            if not names:
+                cls._entries.clear()
+                return
+            for name in names:
+                cls._entries.pop(name, None)
+
+    @classmethod
+    def built_at(cls, name: str) -> Optional[float]:
+        with cls._lock:
+            entry = cls._entries.get(name)
+        return entry[0] if entry else None
@@ -0,0 +1,389 @@
+"""
+SQL task storage for dashboard todos/history, on the shared SQLAlchemy engine.
+"""
+from contextlib import contextmanager
+from datetime import datetime
+from threading import Lock
+from typing import Any, Dict, Iterator, List, Optional
+from uuid import uuid4
+
+from sqlalchemy import and_, func, or_
+from sqlalchemy.orm import Session
+
+from database import SessionLocal, Task, TaskMeta, engine
+from services.task_index import decode_cursor, encode_cursor
+
+PENDING = "pending"
+COMPLETED = "completed"
+
+
+class SqlTaskStore:
+    """Task store backed by the ``tasks`` table; same interface as FileTaskStore.
+
+    Listing runs on the (status, created_at) / (status, completed_at) indexes,
+    and every mutation bumps the ``version`` row in the same transaction.
+    """
+    _ready = False
+    _ready_lock = Lock()
+
+    @classmethod
+    def _now_iso(cls) -> str:
+        return datetime.utcnow().isoformat()
+
+    @staticmethod
+    def _to_dict(row: Task) -> Dict[str, Any]:
+        task = {
+            "id": row.id,
+            "title": row.title,
+            "due_date": row.due_date,
+            "completed": row.status == COMPLETED,
+            "list_name": row.list_name,
+            "created_at": row.created_at,
+            "source": row.source,
+        }
+        if row.status == COMPLETED:
+            task["completed_at"] = row.completed_at
+        return task
+
+    @staticmethod
+    def _from_dict(task: Dict[str, Any], status: str) -> Task:
+        return Task(
+            id=str(task["id"]),
+            title=str(task.get("title") or ""),
+            status=status,
+            list_name=task.get("list_name") or "默认列表",
+            source=task.get("source") or "local",
+            due_date=task.get("due_date"),
+            created_at=task.get("created_at") or datetime.utcnow().isoformat(),
+            completed_at=task.get("completed_at") if status == COMPLETED else None,
+        )
+
+    @classmethod
+    @contextmanager
+    def _session(cls) -> Iterator[Session]:
+        cls._ensure_ready()
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    @classmethod
+    def _ensure_ready(cls):
+        """Create the task tables and run the one-shot import on first use."""
+        if cls._ready:
+            return
+        with cls._ready_lock:
+            if cls._ready:
+                return
+            Task.__table__.create(bind=engine, checkfirst=True)
+            TaskMeta.__table__.create(bind=engine, checkfirst=True)
+            db = SessionLocal()
+            try:
+                cls._import_legacy(db)
+            finally:
+                db.close()
+            cls._ready = True
+
+    @classmethod
+    def _get_meta(cls, db: Session, key: str, for_update: bool = False) -> Optional[TaskMeta]:
+        query = db.query(TaskMeta).filter(TaskMeta.key == key)
+        if for_update:
+            query = query.with_for_update()
+        return query.first()
+
+    @classmethod
+    def _set_meta(cls, db: Session, key: str, value: str):
+        row = cls._get_meta(db, key)
+        if row is None:
+            db.add(TaskMeta(key=key, value=value))
+        else:
+            row.value = value
+
+    @classmethod
+    def _bump_version(cls, db: Session) -> int:
+        """Increment the version row in the caller's transaction and return the new value."""
+        row = cls._get_meta(db, "version", for_update=True)
+        if row is None:
+            db.add(TaskMeta(key="version", value="1"))
+            return 1
+        version = int(row.value or 0) + 1
+        row.value = str(version)
+        return version
+
+    @classmethod
+    def _import_legacy(cls, db: Session):
+        """Copy dashboard_tasks.json (or the todos.md seed) into the table, once."""
+        if cls._get_meta(db, "imported") is not None:
+            return
+
+        from services.task_store import TASKS_FILE, FileTaskStore
+
+        source = "empty"
+        todos: List[Dict[str, Any]] = []
+        completed: List[Dict[str, Any]] = []
+        if db.query(Task.id).first() is None:
+            if TASKS_FILE.exists():
+                # Goes through the file store so un-compacted journal ops are included.
+                todos = FileTaskStore.list_todos()
+                completed = FileTaskStore.list_completed(limit=None)
+                source = "dashboard_tasks_json"
+            else:
+                todos = FileTaskStore._seed_from_markdown()
+                source = "memory_todos_md" if todos else "empty"
+
+        # merge() upserts by id, so an id present in both lists ends up pending.
+        for task in completed:
+            db.merge(cls._from_dict(task, COMPLETED))
+        for task in todos:
+            db.merge(cls._from_dict(task, PENDING))
+        cls._set_meta(db, "imported", source)
+        if todos or completed:
+            cls._bump_version(db)
+        db.commit()
+        if todos or completed:
+            print(f"Imported {len(todos)} todos and {len(completed)} completed tasks from {source}")
+
+    @classmethod
+    def version(cls) -> int:
+        """Monotonic change counter (the ``version`` meta row)."""
+        with cls._session() as db:
+            row = cls._get_meta(db, "version")
+            return int(row.value) if row and row.value else 0
+
+    @classmethod
+    def list_todos(cls) -> List[Dict[str, Any]]:
+        with cls._session() as db:
+            rows = (
+                db.query(Task)
+                .filter(Task.status == PENDING)
+                .order_by(Task.created_at.desc(), Task.id.desc())
+                .all()
+            )
+            return [cls._to_dict(row) for row in rows]
+
+    @classmethod
+    def list_completed(cls, limit: Optional[int] = 20) -> List[Dict[str, Any]]:
+        with cls._session() as db:
+            query = (
+                db.query(Task)
+                .filter(Task.status == COMPLETED)
+                .order_by(Task.completed_at.desc(), Task.id.desc())
+            )
+            if limit is not None:
+                query = query.limit(limit)
+            return [cls._to_dict(row) for row in query.all()]
+
+    @classmethod
+    def query_tasks(cls, completed: bool = False, limit: int = 50, cursor: Optional[str] = None,
+                    list_name: Optional[str] = None, source: Optional[str] = None,
+                    due_from: Optional[str] = None, due_to: Optional[str] = None,
+                    q: Optional[str] = None) -> Dict[str, Any]:
+        """Keyset-paginated, filtered listing (newest first). Raises ValueError on a bad cursor."""
+        before = decode_cursor(cursor) if cursor else None
+        ts_col = Task.completed_at if completed else Task.created_at
+        with cls._session() as db:
+            query = db.query(Task).filter(Task.status == (COMPLETED if completed else PENDING))
+            if before is not None:
+                ts, task_id = before
+                query = query.filter(or_(ts_col < ts, and_(ts_col == ts, Task.id < task_id)))
+            if list_name:
+                query = query.filter(Task.list_name == list_name)
+            if source:
+                query = query.filter(Task.source == source)
+            if due_from:
+                query = query.filter(Task.due_date >= due_from)
+            if due_to:
+                query = query.filter(Task.due_date <= due_to)
+            needle = (q or "").strip().lower()
+            if needle:
+                query = query.filter(func.lower(Task.title).contains(needle, autoescape=True))
+
+            rows = query.order_by(ts_col.desc(), Task.id.desc()).limit(limit + 1).all()
+            next_cursor = None
+            if len(rows) > limit:
+                rows = rows[:limit]
+                last = rows[-1]
+                next_cursor = encode_cursor(((last.completed_at if completed else last.created_at) or "", last.id))
+
+            row = cls._get_meta(db, "version")
+            return {
+                "items": [cls._to_dict(r) for r in rows],
+                "next_cursor": next_cursor,
+                "version": int(row.value) if row and row.value else 0,
+            }
+
+    @classmethod
+    def _new_row(cls, title: Optional[str], list_name: Optional[str], due_date: Optional[str]) -> Task:
+        title = (title or "").strip()
+        if not title:
+            raise ValueError("任务标题不能为空")
+        return Task(
+            id=uuid4().hex[:12],
+            title=title,
+            status=PENDING,
+            list_name=list_name or "默认列表",
+            source="local",
+            due_date=due_date,
+            created_at=cls._now_iso(),
+        )
+
+    @classmethod
+    def _transition_row(cls, db: Session, task_id: str, from_status: str, to_status: str) -> Optional[Task]:
+        row = (
+            db.query(Task)
+            .filter(Task.id == task_id, Task.status == from_status)
+            .with_for_update()
+            .first()
+        )
+        if row is not None:
+            row.status = to_status
+            row.completed_at = cls._now_iso() if to_status == COMPLETED else None
+        return row
+
+    @classmethod
+    def _delete_row(cls, db: Session, task_id: str) -> Optional[Task]:
+        row = db.query(Task).filter(Task.id == task_id, Task.status == PENDING).first()
+        if row is not None:
+            db.delete(row)
+        return row
+
+    @classmethod
+    def create_todo(cls, title: str, list_name: str = "默认列表", due_date: Optional[str] = None) -> Dict[str, Any]:
+        """Returns ``{"task", "version"}``."""
+        row = cls._new_row(title, list_name, due_date)
+        with cls._session() as db:
+            db.add(row)
+            version = cls._bump_version(db)
+            db.commit()
+            return {"task": cls._to_dict(row), "version": version}
+
+    @classmethod
+    def _transition(cls, task_id: str, from_status: str, to_status: str) -> Optional[Dict[str, Any]]:
+        with cls._session() as db:
+            row = cls._transition_row(db, task_id, from_status, to_status)
+            if row is None:
+                return None
+            version = cls._bump_version(db)
+            db.commit()
+            return {"task": cls._to_dict(row), "version": version}
+
+    @classmethod
+    def complete_todo(cls, task_id: str) -> Optional[Dict[str, Any]]:
+        return cls._transition(task_id, PENDING, COMPLETED)
+
+    @classmethod
+    def reopen_task(cls, task_id: str) -> Optional[Dict[str, Any]]:
+        return cls._transition(task_id, COMPLETED, PENDING)
+
+    @classmethod
+    def delete_todo(cls, task_id: str) -> Optional[Dict[str, Any]]:
+        """Delete a pending todo by id; returns ``{"task", "version"}`` or None if it does not exist."""
+        with cls._session() as db:
+            row = cls._delete_row(db, task_id)
+            if row is None:
+                return None
+            task = cls._to_dict(row)
+            version = cls._bump_version(db)
+            db.commit()
+            return {"task": task, "version": version}
+
+    @classmethod
+    def apply_batch(cls, items: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Apply create/complete/reopen/delete items in one transaction with one version bump.
+
+        Items are applied in order; a failed item is reported and skipped, not rolled back.
+        """
+        results: List[Dict[str, Any]] = []
+        with cls._session() as db:
+            applied = 0
+            for item in items:
+                kind = item.get("op")
+                task_id = item.get("id")
+                try:
+                    if kind == "create":
+                        row = cls._new_row(item.get("title"), item.get("list_name"), item.get("due_date"))
+                        db.add(row)
+                    elif kind == "complete":
+                        row = cls._transition_row(db, task_id, PENDING, COMPLETED)
+                    elif kind == "reopen":
+                        row = cls._transition_row(db, task_id, COMPLETED, PENDING)
+                    elif kind == "delete":
+                        row = cls._delete_row(db, task_id)
+                    else:
+                        raise ValueError(f"不支持的操作: {kind}")
+                except ValueError as e:
+                    results.append({"op": kind, "id": task_id, "ok": False, "error": str(e)})
+                    continue
+
+                if row is None:
+                    missing = "历史任务不存在" if kind == "reopen" else "任务不存在"
+                    results.append({"op": kind, "id": task_id, "ok": False, "error": missing})
+                    continue
+                db.flush()  # later items in the batch must see this one
+                applied += 1
+                results.append({"op": kind, "id": row.id, "ok": True, "data": cls._to_dict(row)})
+
+            if applied:
+                version = cls._bump_version(db)
+                db.commit()
+            else:
+                row = cls._get_meta(db, "version")
+                version = int(row.value) if row and row.value else 0
+            return {"results": results, "applied": applied, "version": version}
+
+    @classmethod
+    def sync_apple_todos(cls, todos: List[Dict[str, Any]]) -> Dict[str, int]:
+        """Replace apple-sourced pending todos with latest snapshot."""
+        from services.task_store import FileTaskStore
+
+        with cls._session() as db:
+            db.query(Task).filter(
+                Task.status == PENDING,
+                Task.source.in_(("apple_reminders", "memory_todos_md")),
+            ).delete(synchronize_session=False)
+
+            new_apple = 0
+            for item in todos or []:
+                if not isinstance(item, dict) or item.get("completed"):
+                    continue
+                normalized = FileTaskStore._normalize_task(item, "apple_reminders", completed=False)
+                if normalized["title"]:
+                    db.merge(cls._from_dict(normalized, PENDING))
+                    new_apple += 1
+
+            cls._bump_version(db)
+            db.commit()
+            local_pending = db.query(Task).filter(
+                Task.status == PENDING, Task.source != "apple_reminders"
+            ).count()
+            return {"local_pending": local_pending, "apple_pending": new_apple}
+
+    @classmethod
+    def sync_apple_completed(cls, completed: List[Dict[str, Any]]) -> Dict[str, int]:
+        """Replace apple-sourced completed tasks with latest snapshot."""
+        from services.task_store import FileTaskStore
+
+        with cls._session() as db:
+            db.query(Task).filter(
+                Task.status == COMPLETED, Task.source == "apple_reminders"
+            ).delete(synchronize_session=False)
+
+            apple_done = 0
+            for item in completed or []:
+                if not isinstance(item, dict):
+                    continue
+                normalized = FileTaskStore._normalize_task(item, "apple_reminders", completed=True)
+                if normalized["title"]:
+                    if not normalized.get("completed_at"):
+                        normalized["completed_at"] = cls._now_iso()
+                    # Same primary key, so a still-pending apple copy becomes this completed row.
+                    db.merge(cls._from_dict(normalized, COMPLETED))
+                    apple_done += 1
+
+            cls._bump_version(db)
+            db.commit()
+            local_done = db.query(Task).filter(
+                Task.status == COMPLETED, Task.source != "apple_reminders"
+            ).count()
+            return {"local_completed": local_done, "apple_completed": apple_done}
@@ -0,0 +1,241 @@
+"""
+Status broadcast hub - one background sampler feeding every /ws subscriber
+"""
+import asyncio
+import hashlib
+import json
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional, Set
+
+from config import STATUS_PUSH_INTERVAL, WATCH_DEBOUNCE_SECONDS
+from services.collector import LIGHT_SECTIONS, StatusCollector, sections_depending_on
+from services.file_watcher import FileWatcher
+from services.section_cache import SectionCache
+from services.worker_pools import WorkerPools
+
+# Sections pushed over /ws; todos is cheap now that it is version-tracked, so other devices see task edits live.
+HUB_SECTIONS = LIGHT_SECTIONS + ("todos",)
+
+
+class StatusSubscriber:
+    """Mailbox for a single socket.
+
+    Section updates published while the socket is busy are merged, so a slow
+    client gets one delta with the newest value of every changed section.
+    """
+
+    def __init__(self):
+        self._pending: Dict[str, str] = {}
+        self._needs_snapshot = True
+        self._event = asyncio.Event()
+        if StatusHub.has_state():
+            self._event.set()
+
+    def offer(self, sections: Dict[str, str]):
+        """Merge changed sections (already serialized) into the unsent delta."""
+        self._pending.update(sections)
+        self._event.set()
+
+    def request_resync(self):
+        """Send a full snapshot next instead of a delta."""
+        self._needs_snapshot = True
+        self._pending.clear()
+        self._event.set()
+
+    async def next_frame(self) -> str:
+        """Wait for the next frame to send."""
+        while True:
+            await self._event.wait()
+            self._event.clear()
+            if self._needs_snapshot:
+                if not StatusHub.has_state():
+                    continue  # nothing collected yet; the first tick wakes us again
+                self._needs_snapshot = False
+                self._pending.clear()
+                return StatusHub.snapshot_frame()
+            if self._pending:
+                pending, self._pending = self._pending, {}
+                return StatusHub.delta_frame(pending)
+
+
+class StatusHub:
+    """Collects status once per interval and pushes only the sections whose content changed.
+
+    Every socket first gets a ``status_snapshot`` frame, then ``status_delta``
+    frames carrying changed sections; ``seq`` increases with every change.
+    """
+    _subscribers: Set[StatusSubscriber] = set()
+    _task: Optional[asyncio.Task] = None
+    _loop: Optional[asyncio.AbstractEventLoop] = None
+    _wakeup: Optional[asyncio.Event] = None
+    _sections: Dict[str, str] = {}  # payload key -> serialized JSON value
+    _hashes: Dict[str, str] = {}
+    _timestamp: Optional[str] = None
+    _seq: int = 0
+    _ticks: int = 0
+    _idle_ticks: int = 0
+    _pokes: int = 0
+    _last_collect_ms: float = 0.0
+    _last_fanout_ms: float = 0.0
+    _last_delta_bytes: int = 0
+    _last_tick_at: Optional[float] = None
+
+    @classmethod
+    def start(cls):
+        """Start the sampler task (called from the app lifespan)."""
+        if cls._task and not cls._task.done():
+            return
+        cls._loop = asyncio.get_running_loop()
+        cls._wakeup = asyncio.Event()
+        cls._task = asyncio.create_task(cls._run())
+
+    @classmethod
+    async def stop(cls):
+        """Cancel the sampler task and drop all subscribers."""
+        task, cls._task = cls._task, None
+        if task:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        cls._subscribers.clear()
+        cls._reset_state()
+
+    @classmethod
+    def subscribe(cls) -> StatusSubscriber:
+        """Register a socket; it receives a snapshot as soon as one is available."""
+        subscriber = StatusSubscriber()
+        cls._subscribers.add(subscriber)
+        if cls._wakeup:
+            cls._wakeup.set()
+        return subscriber
+
+    @classmethod
+    def unsubscribe(cls, subscriber: StatusSubscriber):
+        cls._subscribers.discard(subscriber)
+
+    @classmethod
+    def notify_change(cls, deps: Iterable[str]):
+        """Watched inputs changed: drop the affected sections and push without waiting for the tick.
+
+        Safe to call from any thread (the file watcher calls it from its own).
+        """
+        stale = sections_depending_on(deps)
+        if stale:
+            SectionCache.invalidate(*stale)
+        loop, wakeup = cls._loop, cls._wakeup
+        if loop is None or wakeup is None or loop.is_closed():
+            return
+        cls._pokes += 1
+        loop.call_soon_threadsafe(wakeup.set)
+
+    @classmethod
+    def has_state(cls) -> bool:
+        return bool(cls._sections)
+
+    @classmethod
+    def _reset_state(cls):
+        cls._sections = {}
+        cls._hashes = {}
+        cls._timestamp = None
+
+    @classmethod
+    def _frame(cls, kind: str, sections: Dict[str, str]) -> str:
+        # Sections are spliced in pre-serialized, so fan-out never re-encodes them per socket.
+        body = ",".join(f"{json.dumps(key)}:{raw}" for key, raw in sections.items())
+        return f'{{"type":"{kind}","seq":{cls._seq},"timestamp":{json.dumps(cls._timestamp)},"sections":{{{body}}}}}'
+
+    @classmethod
+    def snapshot_frame(cls) -> str:
+        return cls._frame("status_snapshot", cls._sections)
+
+    @classmethod
+    def delta_frame(cls, sections: Dict[str, str]) -> str:
+        return cls._frame("status_delta", sections)
+
+    @classmethod
+    def _collect(cls) -> Dict[str, Any]:
+        return StatusCollector().get_full_status(sections=HUB_SECTIONS)
+
+    @classmethod
+    def _diff(cls, payload: Dict[str, Any]) -> Dict[str, str]:
+        """Store the new payload and return the serialized sections whose content hash changed."""
+        cls._timestamp = payload.pop("timestamp", None)
+        changed = {}
+        for key, value in payload.items():
+            raw = json.dumps(value, default=str)
+            digest = hashlib.sha1(raw.encode("utf-8")).hexdigest()
+            if cls._hashes.get(key) != digest:
+                cls._hashes[key] = digest
+                cls._sections[key] = raw
+                changed[key] = raw
+        return changed
+
+    @classmethod
+    def _publish(cls, changed: Dict[str, str]):
+        started = time.perf_counter()
+        for subscriber in list(cls._subscribers):
+            subscriber.offer(changed)
+        cls._last_fanout_ms = (time.perf_counter() - started) * 1000
+        cls._last_delta_bytes = sum(len(raw) for raw in changed.values())
+
+    @classmethod
+    async def _run(cls):
+        while True:
+            if not cls._subscribers:
+                # Nobody is listening; sleep until the next subscribe().
+                cls._reset_state()
+                cls._wakeup.clear()
+                await cls._wakeup.wait()
+                continue
+
+            started = time.perf_counter()
+            try:
+                payload = await WorkerPools.run("file_io", cls._collect)
+            except Exception as e:
+                print(f"Status sampler error: {e}")
+                payload = None
+            cls._last_collect_ms = (time.perf_counter() - started) * 1000
+
+            if payload is not None:
+                changed = cls._diff(payload)
+                if changed:
+                    cls._seq += 1
+                    cls._publish(changed)
+                else:
+                    cls._idle_ticks += 1
+                cls._ticks += 1
+                cls._last_tick_at = time.time()
+
+            await cls._sleep_until_next_tick()
+
+    @classmethod
+    async def _sleep_until_next_tick(cls):
+        """Sleep one interval, or less if a file change (or new subscriber) wakes us."""
+        try:
+            await asyncio.wait_for(cls._wakeup.wait(), timeout=STATUS_PUSH_INTERVAL)
+        except asyncio.TimeoutError:
+            return
+        await asyncio.sleep(WATCH_DEBOUNCE_SECONDS)  # let a burst of writes (tmp + rename) settle
+        cls._wakeup.clear()
+
+    @classmethod
+    def stats(cls) -> Dict[str, Any]:
+        """Hub health for diagnostics."""
+        return {
+            "running": bool(cls._task and not cls._task.done()),
+            "subscribers": len(cls._subscribers),
+            "interval_seconds": STATUS_PUSH_INTERVAL,
+            "ticks": cls._ticks,
+            "idle_ticks": cls._idle_ticks,
+            "pokes": cls._pokes,
+            "seq": cls._seq,
+            "last_tick_at": datetime.fromtimestamp(cls._last_tick_at).isoformat() if cls._last_tick_at else None,
+            "last_collect_ms": round(cls._last_collect_ms, 3),
+            "last_fanout_ms": round(cls._last_fanout_ms, 3),
+            "last_delta_bytes": cls._last_delta_bytes,
+            "snapshot_bytes": sum(len(raw) for raw in cls._sections.values()),
+            "watcher": FileWatcher.stats(),
+        }
@@ -0,0 +1,104 @@
+"""
+Subagent runs index - parsed once per change of subagents/runs.json
+"""
+import threading
+from itertools import islice
+from typing import Any, Dict, List, Optional, Tuple
+
+from config import SUBAGENT_RUNS_FILE
+from models import SubAgentRun
+from services.config_cache import ConfigCache
+
+
+class SubagentRunIndex:
+    """Runs newest first, with per-status lists and counters.
+
+    Rebuilt only when the runs file's (mtime, size) changes; between changes
+    every read is served from the prebuilt lists.
+    """
+    _lock = threading.Lock()
+    _fp: Optional[Tuple[int, int]] = None
+    _loaded = False
+    _runs: List[SubAgentRun] = []
+    _by_status: Dict[str, List[SubAgentRun]] = {}
+    _rebuilds: int = 0
+
+    @classmethod
+    def _build(cls, data: Any) -> Tuple[List[SubAgentRun], Dict[str, List[SubAgentRun]]]:
+        keyed = []
+        runs_data = data.get("runs", {}) if data is not None else {}
+        for position, (run_id, run_data) in enumerate(runs_data.items()):
+            try:
+                run = SubAgentRun(
+                    run_id=run_id,
+                    agent_name=run_data.get("agentName", ""),
+                    status=run_data.get("status", "unknown"),
+                    start_time=run_data.get("startTime"),
+                    end_time=run_data.get("endTime"),
+                    error=run_data.get("error")
+                )
+            except (AttributeError, ValueError):
+                continue  # one malformed entry should not hide the rest
+            # Later entries in the file win ties, as they were added later.
+            keyed.append(((run.start_time or "", position), run))
+        keyed.sort(key=lambda item: item[0], reverse=True)
+
+        runs = [run for _, run in keyed]
+        by_status: Dict[str, List[SubAgentRun]] = {}
+        for run in runs:
+            by_status.setdefault(run.status, []).append(run)
+        return runs, by_status
+
+    @classmethod
+    def _refresh(cls):
+        fp = ConfigCache.fingerprint(SUBAGENT_RUNS_FILE)
+        with cls._lock:
+            if cls._loaded and fp == cls._fp:
+                return
+        try:
+            runs, by_status = cls._build(ConfigCache.load_json(SUBAGENT_RUNS_FILE))
+        except Exception:
+            runs, by_status = [], {}
+        with cls._lock:
+            cls._fp = fp
+            cls._loaded = True
+            cls._runs = runs
+            cls._by_status = by_status
+            cls._rebuilds += 1
+
+    @classmethod
+    def all_runs(cls) -> List[SubAgentRun]:
+        cls._refresh()
+        return cls._runs
+
+    @classmethod
+    def summary(cls, recent_limit: int) -> Dict[str, Any]:
+        """Counters, total and the runs to show in status: every running run plus ``recent_limit`` others."""
+        cls._refresh()
+        with cls._lock:
+            running = cls._by_status.get("running", [])
+            recent = list(islice((run for run in cls._runs if run.status != "running"), recent_limit))
+            return {
+                "total": len(cls._runs),
+                "counts": {status: len(runs) for status, runs in cls._by_status.items()},
+                "running": len(running),
+                "runs": running + recent,
+            }
+
+    @classmethod
+    def page(cls, offset: int = 0, limit: int = 50, status: Optional[str] = None) -> Dict[str, Any]:
+        """A newest-first slice of run history, optionally for one status."""
+        cls._refresh()
+        with cls._lock:
+            runs = cls._by_status.get(status, []) if status else cls._runs
+            return {
+                "runs": runs[offset:offset + limit],
+                "total": len(runs),
+                "offset": offset,
+                "limit": limit,
+                "counts": {name: len(items) for name, items in cls._by_status.items()},
+            }
+
+    @classmethod
+    def stats(cls) -> Dict[str, Any]:
+        return {"runs": len(cls._runs), "rebuilds": cls._rebuilds}
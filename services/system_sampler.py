@@ -0,0 +1,103 @@
+"""
+System resource sampler - keeps CPU/memory/disk readings primed in the background
+"""
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+import psutil
+
+from config import SYSTEM_FIRST_SAMPLE_DELAY, SYSTEM_SAMPLE_INTERVAL, SYSTEM_SAMPLE_WINDOW
+
+
+# (timestamp, cpu_percent, memory_percent, disk_usage_percent)
+Sample = Tuple[float, float, float, float]
+
+
+class SystemSampler:
+    """Rolling window of system readings so callers never block on psutil.
+
+    ``psutil.cpu_percent`` measures against a process-wide baseline, so it is
+    only ever called from the sampler thread.
+    """
+    _lock = threading.Lock()
+    _samples: Deque[Sample] = deque(maxlen=max(int(SYSTEM_SAMPLE_WINDOW / SYSTEM_SAMPLE_INTERVAL), 1))
+    _thread: Optional[threading.Thread] = None
+    _stop = threading.Event()
+    _ready = threading.Event()  # set once the first reading has been attempted
+
+    @classmethod
+    def start(cls):
+        """Start the sampling thread if needed and wait for its first reading."""
+        with cls._lock:
+            if not (cls._thread and cls._thread.is_alive()):
+                cls._stop.clear()
+                cls._ready.clear()
+                cls._thread = threading.Thread(target=cls._run, name="system-sampler", daemon=True)
+                cls._thread.start()
+        cls._ready.wait(SYSTEM_FIRST_SAMPLE_DELAY + 1.0)
+
+    @classmethod
+    def stop(cls):
+        cls._stop.set()
+
+    @classmethod
+    def _read(cls) -> Sample:
+        return (
+            time.time(),
+            psutil.cpu_percent(interval=None),
+            psutil.virtual_memory().percent,
+            psutil.disk_usage('/').percent,
+        )
+
+    @classmethod
+    def _sample(cls):
+        try:
+            sample = cls._read()
+        except Exception:
+            return
+        with cls._lock:
+            cls._samples.append(sample)
+
+    @classmethod
+    def _run(cls):
+        # Prime psutil's CPU counters, then take the first reading over a short real interval.
+        psutil.cpu_percent(interval=None)
+        if not cls._stop.wait(SYSTEM_FIRST_SAMPLE_DELAY):
+            cls._sample()
+        cls._ready.set()
+        while not cls._stop.wait(SYSTEM_SAMPLE_INTERVAL):
+            cls._sample()
+
+    @classmethod
+    def latest(cls) -> Sample:
+        """Most recent reading; the first call waits for the sampler's first reading."""
+        cls.start()
+        with cls._lock:
+            if cls._samples:
+                return cls._samples[-1]
+        # psutil failed in the sampler; report memory/disk without touching the CPU baseline.
+        return time.time(), 0.0, psutil.virtual_memory().percent, psutil.disk_usage('/').percent
+
+    @classmethod
+    def cpu_average(cls, seconds: int) -> Optional[float]:
+        """Mean CPU percent over the last ``seconds`` of the window."""
+        cutoff = time.time() - seconds
+        with cls._lock:
+            values = [s[1] for s in cls._samples if s[0] >= cutoff]
+        if not values:
+            return None
+        return round(sum(values) / len(values), 1)
+
+    @classmethod
+    def snapshot(cls) -> Dict[str, Any]:
+        ts, cpu, memory, disk = cls.latest()
+        return {
+            "sampled_at": ts,
+            "cpu_percent": cpu,
+            "memory_percent": memory,
+            "disk_usage_percent": disk,
+            "cpu_avg_1m": cls.cpu_average(60),
+            "cpu_avg_5m": cls.cpu_average(300),
+        }
@@ -0,0 +1,164 @@
+"""
+Resident task index: id lookup, time-sorted views and per-list secondary index.
+"""
+import base64
+import json
+from bisect import bisect_left, insort
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+SortKey = Tuple[str, str]
+
+
+def encode_cursor(key: SortKey) -> str:
+    """Opaque keyset cursor for the (timestamp, id) of the last task on a page."""
+    return base64.urlsafe_b64encode(json.dumps(list(key)).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> SortKey:
+    try:
+        ts, task_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return str(ts), str(task_id)
+    except Exception:
+        raise ValueError("无效的分页游标")
+
+
+def task_filter(list_name: Optional[str] = None, source: Optional[str] = None,
+                due_from: Optional[str] = None, due_to: Optional[str] = None,
+                q: Optional[str] = None) -> Optional[Callable[[Dict[str, Any]], bool]]:
+    """Predicate for the listing filters, or None when no filter is set.
+
+    The due range is inclusive and compares ISO strings; tasks without a due date never match it.
+    """
+    needle = (q or "").strip().lower()
+    if not (list_name or source or due_from or due_to or needle):
+        return None
+
+    def match(task: Dict[str, Any]) -> bool:
+        if list_name and task.get("list_name") != list_name:
+            return False
+        if source and task.get("source") != source:
+            return False
+        if due_from or due_to:
+            due = task.get("due_date")
+            if not due or (due_from and due < due_from) or (due_to and due > due_to):
+                return False
+        if needle and needle not in str(task.get("title") or "").lower():
+            return False
+        return True
+
+    return match
+
+
+class _SortedBucket:
+    """Tasks by id plus keys kept in ascending (timestamp, id) order."""
+
+    def __init__(self, time_field: str):
+        self.time_field = time_field
+        self.by_id: Dict[str, Dict[str, Any]] = {}
+        self._keys: List[SortKey] = []
+        self._key_of: Dict[str, SortKey] = {}
+
+    def add(self, task: Dict[str, Any], presorted: bool = False):
+        task_id = task["id"]
+        key = (str(task.get(self.time_field) or ""), task_id)
+        self.by_id[task_id] = task
+        self._key_of[task_id] = key
+        if presorted:
+            self._keys.append(key)
+        else:
+            insort(self._keys, key)
+
+    def remove(self, task_id: str) -> Optional[Dict[str, Any]]:
+        task = self.by_id.pop(task_id, None)
+        if task is None:
+            return None
+        key = self._key_of.pop(task_id)
+        pos = bisect_left(self._keys, key)
+        del self._keys[pos]
+        return task
+
+    def sort(self):
+        self._keys.sort()
+
+    def newest_first(self, before: Optional[SortKey] = None) -> Iterator[Dict[str, Any]]:
+        """Walk newest to oldest, starting just below ``before`` when given."""
+        pos = bisect_left(self._keys, before) if before is not None else len(self._keys)
+        for i in range(pos - 1, -1, -1):
+            yield self.by_id[self._keys[i][1]]
+
+    def key_of(self, task_id: str) -> SortKey:
+        return self._key_of[task_id]
+
+    def __len__(self) -> int:
+        return len(self.by_id)
+
+
+class TaskIndex:
+    """In-memory view of pending and completed tasks.
+
+    Add/remove by id are dict hits; ``todos`` is newest-created first and
+    ``completed(limit)`` walks only ``limit`` entries of the completed_at order.
+    Equal timestamps are ordered by id, the same tie-break the SQL store uses.
+    """
+
+    def __init__(self, todos: List[Any], completed: List[Any]):
+        self._todos = _SortedBucket("created_at")
+        self._completed = _SortedBucket("completed_at")
+        self._load_bucket(self._todos, todos)
+        self._load_bucket(self._completed, completed)
+
+    def _load_bucket(self, bucket: _SortedBucket, items: List[Any]):
+        # The first occurrence of an id in the stored (newest-first) list wins.
+        tasks = [t for t in items or [] if isinstance(t, dict) and t.get("id")]
+        seen: Set[str] = set()
+        unique = []
+        for task in tasks:
+            if task["id"] in seen:
+                continue
+            seen.add(task["id"])
+            unique.append(task)
+        for task in unique:
+            bucket.add(task, presorted=True)
+        bucket.sort()
+
+    def add_todo(self, task: Dict[str, Any]):
+        self.remove_todo(task["id"])
+        self._todos.add(task)
+
+    def remove_todo(self, task_id: str) -> Optional[Dict[str, Any]]:
+        return self._todos.remove(task_id)
+
+    def add_completed(self, task: Dict[str, Any]):
+        self.remove_completed(task["id"])
+        self._completed.add(task)
+
+    def remove_completed(self, task_id: str) -> Optional[Dict[str, Any]]:
+        return self._completed.remove(task_id)
+
+    def todos(self) -> List[Dict[str, Any]]:
+        return list(self._todos.newest_first())
+
+    def completed(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        out = []
+        for task in self._completed.newest_first():
+            if limit is not None and len(out) >= limit:
+                break
+            out.append(task)
+        return out
+
+    def page(self, completed: bool, limit: int, cursor: Optional[str] = None,
+             match: Optional[Callable[[Dict[str, Any]], bool]] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """One newest-first page after ``cursor`` plus the cursor for the next page (None at the end)."""
+        bucket = self._completed if completed else self._todos
+        before = decode_cursor(cursor) if cursor else None
+        items: List[Dict[str, Any]] = []
+        for task in bucket.newest_first(before):
+            if match is not None and not match(task):
+                continue
+            if len(items) == limit:
+                return items, encode_cursor(bucket.key_of(items[-1]["id"]))
+            items.append(task)
+        return items, None
+
+    def counts(self) -> Dict[str, int]:
+        return {"todos": len(self._todos), "completed": len(self._completed)}
@@ -0,0 +1,144 @@
+"""
+Append-only operation journal with snapshot compaction for the local task store.
+"""
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class TaskJournal:
+    """JSON snapshot plus a JSON-lines op log; fsyncs are batched, compaction is atomic"""
+
+    def __init__(self, snapshot_path: Path, journal_path: Path, fsync_interval: float):
+        self.snapshot_path = snapshot_path
+        self.journal_path = journal_path
+        self.fsync_interval = fsync_interval
+        self.pending_ops = 0  # ops appended since the last snapshot
+        self._fh = None
+        self._sync_lock = threading.Lock()
+        self._dirty = False
+        self._last_fsync = 0.0
+        self._timer: Optional[threading.Timer] = None
+
+    def fingerprint(self) -> Tuple[Any, Any]:
+        """(mtime_ns, size) of snapshot and journal, to notice writes from other processes."""
+        out = []
+        for path in (self.snapshot_path, self.journal_path):
+            try:
+                st = path.stat()
+                out.append((st.st_mtime_ns, st.st_size))
+            except OSError:
+                out.append(None)
+        return tuple(out)
+
+    def read(self) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Return (snapshot or None, journal ops). A torn trailing line from a crash is cut off."""
+        snapshot = None
+        if self.snapshot_path.exists():
+            try:
+                snapshot = json.loads(self.snapshot_path.read_text() or "{}")
+            except Exception:
+                snapshot = {}
+
+        ops: List[Dict[str, Any]] = []
+        if not self.journal_path.exists():
+            return snapshot, ops
+
+        data = self.journal_path.read_bytes()
+        good_end = 0
+        pos = 0
+        while pos < len(data):
+            end = data.find(b"\n", pos)
+            if end == -1:
+                break
+            try:
+                op = json.loads(data[pos:end])
+            except ValueError:
+                break
+            if isinstance(op, dict):
+                ops.append(op)
+            pos = end + 1
+            good_end = pos
+
+        if good_end < len(data):
+            self._close()
+            with open(self.journal_path, "r+b") as f:
+                f.truncate(good_end)
+        return snapshot, ops
+
+    def append(self, ops: List[Dict[str, Any]]):
+        """Append ops as one write; the fsync may be deferred by up to ``fsync_interval``."""
+        if self._fh is None:
+            self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+            self._fh = open(self.journal_path, "ab")
+        self._fh.write(b"".join(json.dumps(op, ensure_ascii=False).encode("utf-8") + b"\n" for op in ops))
+        self._fh.flush()
+        self.pending_ops += len(ops)
+        self._schedule_fsync()
+
+    def _schedule_fsync(self):
+        with self._sync_lock:
+            self._dirty = True
+            wait = self.fsync_interval - (time.monotonic() - self._last_fsync)
+            if wait <= 0:
+                self._fsync_locked()
+            elif self._timer is None:
+                self._timer = threading.Timer(wait, self._timer_fsync)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _timer_fsync(self):
+        with self._sync_lock:
+            self._timer = None
+            self._fsync_locked()
+
+    def _fsync_locked(self):
+        if self._dirty and self._fh is not None:
+            try:
+                os.fsync(self._fh.fileno())
+            except (OSError, ValueError):
+                pass
+        self._dirty = False
+        self._last_fsync = time.monotonic()
+
+    def flush(self):
+        """Force any batched fsync now."""
+        with self._sync_lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self._fsync_locked()
+
+    def _close(self):
+        self.flush()
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+    def write_snapshot(self, payload: Dict[str, Any]):
+        """Atomically replace the snapshot with ``payload`` and empty the journal."""
+        self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.snapshot_path.with_name(self.snapshot_path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(json.dumps(payload, ensure_ascii=False, indent=2))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.snapshot_path)
+        try:
+            dir_fd = os.open(self.snapshot_path.parent, os.O_RDONLY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+        except OSError:
+            pass
+
+        # The snapshot records journal_seq, so a crash before this truncate only replays no-ops.
+        self._close()
+        if self.journal_path.exists():
+            with open(self.journal_path, "wb"):
+                pass
+        self.pending_ops = 0
@@ -4,20 +4,26 @@ Local task storage for dashboard todos/history.
 import json
 import re
 from datetime import datetime
-from pathlib import Path
 from threading import Lock
 from typing import Any, Dict, List, Optional
 from uuid import uuid4
 
-from config import OPENCLAW_DIR
+from config import OPENCLAW_DIR, TASK_JOURNAL_FSYNC_INTERVAL, TASK_JOURNAL_COMPACT_OPS, TASK_STORE_BACKEND
+from services.task_index import TaskIndex, task_filter
+from services.task_journal import TaskJournal
 
 
 TASKS_FILE = OPENCLAW_DIR / "dashboard_tasks.json"
+TASKS_JOURNAL_FILE = OPENCLAW_DIR / "dashboard_tasks.journal"
 
 
-class TaskStore:
-    """File-backed task store."""
+class FileTaskStore:
+    """File-backed task store: JSON snapshot plus an append-only op journal, served from a resident index."""
     _lock = Lock()
+    _journal = TaskJournal(TASKS_FILE, TASKS_JOURNAL_FILE, TASK_JOURNAL_FSYNC_INTERVAL)
+    _meta: Optional[Dict[str, Any]] = None  # snapshot fields other than the task lists
+    _index: Optional[TaskIndex] = None
+    _state_fp: Optional[tuple] = None
 
     @classmethod
     def _now_iso(cls) -> str:
@@ -27,6 +33,7 @@ class TaskStore:
     def _default_payload(cls) -> Dict[str, Any]:
         return {
             "version": 1,
+            "journal_seq": 0,
             "updated_at": cls._now_iso(),
             "bootstrap_done": False,
             "bootstrap_sources": [],
@@ -35,42 +42,146 @@ class TaskStore:
         }
 
     @classmethod
-    def _ensure_file(cls):
-        if TASKS_FILE.exists():
-            return
-        TASKS_FILE.parent.mkdir(parents=True, exist_ok=True)
-        TASKS_FILE.write_text(json.dumps(cls._default_payload(), ensure_ascii=False, indent=2))
+    def _load(cls) -> TaskIndex:
+        """Resident index; rebuilt from snapshot + journal only when either file changed."""
+        fp = cls._journal.fingerprint()
+        if cls._index is not None and fp == cls._state_fp:
+            return cls._index
 
-    @classmethod
-    def _load(cls) -> Dict[str, Any]:
-        cls._ensure_file()
-        try:
-            payload = json.loads(TASKS_FILE.read_text() or "{}")
-        except Exception:
-            payload = cls._default_payload()
+        snapshot, ops = cls._journal.read()
+        payload = snapshot
         if not isinstance(payload, dict):
             payload = cls._default_payload()
-        payload.setdefault("todos", [])
-        payload.setdefault("completed", [])
+        payload.setdefault("journal_seq", 0)
         payload.setdefault("updated_at", cls._now_iso())
         payload.setdefault("bootstrap_done", False)
         payload.setdefault("bootstrap_sources", [])
+        index = TaskIndex(payload.pop("todos", None) or [], payload.pop("completed", None) or [])
+
+        replayed = 0
+        for op in ops:
+            seq = op.get("seq") or 0
+            if seq <= payload["journal_seq"]:
+                continue  # already folded into the snapshot
+            cls._apply(index, op)
+            payload["journal_seq"] = seq
+            replayed += 1
+        cls._journal.pending_ops = replayed
+        cls._meta = payload
+        cls._index = index
+        cls._state_fp = cls._journal.fingerprint()
+
+        if snapshot is None:
+            cls._save()
 
         # Best-effort one-time bootstrap for existing reminders/tasks.
-        if (not payload.get("bootstrap_done")) and not payload.get("todos") and not payload.get("completed"):
+        counts = index.counts()
+        if (not payload.get("bootstrap_done")) and not counts["todos"] and not counts["completed"]:
             seeded, source = cls._bootstrap_seed_tasks()
             if seeded:
-                payload["todos"] = seeded
+                cls._index = TaskIndex(seeded, [])
                 if source:
                     payload["bootstrap_sources"] = [source]
             payload["bootstrap_done"] = True
-            cls._save(payload)
-        return payload
+            cls._save()
+        return cls._index
+
+    @classmethod
+    def _save(cls):
+        """Write a full snapshot of the resident state (compaction) and reset the journal."""
+        cls._meta["updated_at"] = cls._now_iso()
+        payload = dict(cls._meta)
+        payload["todos"] = cls._index.todos()
+        payload["completed"] = cls._index.completed()
+        try:
+            cls._journal.write_snapshot(payload)
+        except Exception:
+            cls._index = None
+            raise
+        cls._state_fp = cls._journal.fingerprint()
+
+    @classmethod
+    def _apply(cls, index: TaskIndex, op: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Apply one journal op to ``index``; returns the affected task or None if it was a no-op.
+
+        Tasks are replaced rather than mutated so lists handed out earlier stay unchanged.
+        """
+        kind = op.get("op")
+        if kind == "create":
+            task = dict(op["task"])
+            index.add_todo(task)
+            return task
+
+        if kind == "delete":
+            return index.remove_todo(op.get("id"))
+
+        if kind == "complete":
+            item = index.remove_todo(op.get("id"))
+            if item is None:
+                return None
+            task = dict(item)
+            task["completed"] = True
+            task["completed_at"] = op.get("completed_at") or cls._now_iso()
+            index.add_completed(task)
+            return task
+
+        if kind == "reopen":
+            item = index.remove_completed(op.get("id"))
+            if item is None:
+                return None
+            task = dict(item)
+            task["completed"] = False
+            task.pop("completed_at", None)
+            index.add_todo(task)
+            return task
+
+        return None
+
+    @classmethod
+    def _commit(cls, op: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Apply ``op`` to the resident index and append it to the journal (O(1) bytes written).
+
+        Returns ``{"task", "version"}`` with the version this op committed, or None if it was a no-op.
+        """
+        index = cls._load()
+        op["seq"] = cls._meta["journal_seq"] + 1
+        op["at"] = cls._now_iso()
+        result = cls._apply(index, op)
+        if result is None:
+            return None
+        cls._persist([op])
+        return {"task": result, "version": op["seq"]}
 
     @classmethod
-    def _save(cls, payload: Dict[str, Any]):
-        payload["updated_at"] = cls._now_iso()
-        TASKS_FILE.write_text(json.dumps(payload, ensure_ascii=False, indent=2))
+    def _persist(cls, ops: List[Dict[str, Any]]):
+        """Append already-applied ops as one journal write, compacting when the journal is long."""
+        cls._meta["journal_seq"] = ops[-1]["seq"]
+        cls._meta["updated_at"] = ops[-1]["at"]
+        try:
+            cls._journal.append(ops)
+        except Exception:
+            cls._index = None  # memory is ahead of disk; reload on next access
+            raise
+
+        if cls._journal.pending_ops >= TASK_JOURNAL_COMPACT_OPS:
+            cls._save()
+        else:
+            cls._state_fp = cls._journal.fingerprint()
+
+    @classmethod
+    def _new_task(cls, title: Optional[str], list_name: Optional[str], due_date: Optional[str]) -> Dict[str, Any]:
+        title = (title or "").strip()
+        if not title:
+            raise ValueError("任务标题不能为空")
+        return {
+            "id": uuid4().hex[:12],
+            "title": title,
+            "due_date": due_date,
+            "completed": False,
+            "list_name": list_name or "默认列表",
+            "created_at": cls._now_iso(),
+            "source": "local",
+        }
 
     @classmethod
     def _normalize_task(cls, item: Dict[str, Any], source: str, completed: bool) -> Dict[str, Any]:
@@ -90,8 +201,8 @@ class TaskStore:
     def sync_apple_todos(cls, todos: List[Dict[str, Any]]) -> Dict[str, int]:
         """Replace apple-sourced pending todos with latest snapshot."""
         with cls._lock:
-            payload = cls._load()
-            pending = payload.get("todos") or []
+            index = cls._load()
+            pending = index.todos()
             local_pending = [
                 t for t in pending
                 if isinstance(t, dict)
@@ -108,16 +219,17 @@ class TaskStore:
                 if normalized["title"]:
                     new_apple.append(normalized)
 
-            payload["todos"] = local_pending + new_apple
-            cls._save(payload)
+            cls._index = TaskIndex(local_pending + new_apple, index.completed())
+            cls._meta["journal_seq"] += 1  # wholesale replace still counts as a change
+            cls._save()
             return {"local_pending": len(local_pending), "apple_pending": len(new_apple)}
 
     @classmethod
     def sync_apple_completed(cls, completed: List[Dict[str, Any]]) -> Dict[str, int]:
         """Replace apple-sourced completed tasks with latest snapshot."""
         with cls._lock:
-            payload = cls._load()
-            done = payload.get("completed") or []
+            index = cls._load()
+            done = index.completed()
             local_done = [t for t in done if isinstance(t, dict) and t.get("source") != "apple_reminders"]
 
             apple_done = []
@@ -133,13 +245,13 @@ class TaskStore:
                     completed_ids.add(normalized["id"])
 
             # Ensure pending list does not keep completed apple items.
-            pending = payload.get("todos") or []
-            payload["todos"] = [
-                t for t in pending
-                if not (isinstance(t, dict) and t.get("source") == "apple_reminders" and t.get("id") in completed_ids)
+            pending = [
+                t for t in index.todos()
+                if not (t.get("source") == "apple_reminders" and t.get("id") in completed_ids)
             ]
-            payload["completed"] = local_done + apple_done
-            cls._save(payload)
+            cls._index = TaskIndex(pending, local_done + apple_done)
+            cls._meta["journal_seq"] += 1  # wholesale replace still counts as a change
+            cls._save()
             return {"local_completed": len(local_done), "apple_completed": len(apple_done)}
 
     @classmethod
@@ -184,95 +296,99 @@ class TaskStore:
     @classmethod
     def list_todos(cls) -> List[Dict[str, Any]]:
         with cls._lock:
-            payload = cls._load()
-            todos = payload.get("todos") or []
-            todos = [t for t in todos if isinstance(t, dict)]
-            todos.sort(key=lambda t: t.get("created_at") or "", reverse=True)
-            return todos
+            return cls._load().todos()
 
     @classmethod
     def list_completed(cls, limit: Optional[int] = 20) -> List[Dict[str, Any]]:
         with cls._lock:
-            payload = cls._load()
-            completed = payload.get("completed") or []
-            completed = [t for t in completed if isinstance(t, dict)]
-            completed.sort(key=lambda t: t.get("completed_at") or "", reverse=True)
-            if limit is not None:
-                return completed[:limit]
-            return completed
+            return cls._load().completed(limit=limit)
 
     @classmethod
-    def create_todo(cls, title: str, list_name: str = "默认列表", due_date: Optional[str] = None) -> Dict[str, Any]:
-        title = (title or "").strip()
-        if not title:
-            raise ValueError("任务标题不能为空")
+    def query_tasks(cls, completed: bool = False, limit: int = 50, cursor: Optional[str] = None,
+                    list_name: Optional[str] = None, source: Optional[str] = None,
+                    due_from: Optional[str] = None, due_to: Optional[str] = None,
+                    q: Optional[str] = None) -> Dict[str, Any]:
+        """Keyset-paginated, filtered listing (newest first). Raises ValueError on a bad cursor."""
+        match = task_filter(list_name, source, due_from, due_to, q)
+        with cls._lock:
+            items, next_cursor = cls._load().page(completed, limit, cursor, match)
+            return {"items": items, "next_cursor": next_cursor, "version": cls._meta["journal_seq"]}
 
+    @classmethod
+    def version(cls) -> int:
+        """Monotonic change counter (the journal sequence number)."""
         with cls._lock:
-            payload = cls._load()
-            task = {
-                "id": uuid4().hex[:12],
-                "title": title,
-                "due_date": due_date,
-                "completed": False,
-                "list_name": list_name or "默认列表",
-                "created_at": cls._now_iso(),
-                "source": "local",
-            }
-            payload["todos"] = [task] + (payload.get("todos") or [])
-            cls._save(payload)
-            return task
+            cls._load()
+            return cls._meta["journal_seq"]
+
+    @classmethod
+    def create_todo(cls, title: str, list_name: str = "默认列表", due_date: Optional[str] = None) -> Dict[str, Any]:
+        """Returns ``{"task", "version"}``."""
+        task = cls._new_task(title, list_name, due_date)
+        with cls._lock:
+            return cls._commit({"op": "create", "task": task})
 
     @classmethod
     def complete_todo(cls, task_id: str) -> Optional[Dict[str, Any]]:
         with cls._lock:
-            payload = cls._load()
-            todos = payload.get("todos") or []
-            picked = None
-            remain = []
-            for item in todos:
-                if not picked and item.get("id") == task_id:
-                    picked = item
-                else:
-                    remain.append(item)
-            if not picked:
-                return None
-            picked["completed"] = True
-            picked["completed_at"] = cls._now_iso()
-            payload["todos"] = remain
-            payload["completed"] = [picked] + (payload.get("completed") or [])
-            cls._save(payload)
-            return picked
+            return cls._commit({"op": "complete", "id": task_id, "completed_at": cls._now_iso()})
 
     @classmethod
-    def delete_todo(cls, task_id: str) -> bool:
-        """Delete a pending todo by id."""
+    def delete_todo(cls, task_id: str) -> Optional[Dict[str, Any]]:
+        """Delete a pending todo by id; returns ``{"task", "version"}`` or None if it does not exist."""
         with cls._lock:
-            payload = cls._load()
-            todos = payload.get("todos") or []
-            remain = [t for t in todos if not (isinstance(t, dict) and t.get("id") == task_id)]
-            changed = len(remain) != len(todos)
-            if changed:
-                payload["todos"] = remain
-                cls._save(payload)
-            return changed
+            return cls._commit({"op": "delete", "id": task_id})
 
     @classmethod
     def reopen_task(cls, task_id: str) -> Optional[Dict[str, Any]]:
         with cls._lock:
-            payload = cls._load()
-            completed = payload.get("completed") or []
-            picked = None
-            remain = []
-            for item in completed:
-                if not picked and item.get("id") == task_id:
-                    picked = item
-                else:
-                    remain.append(item)
-            if not picked:
-                return None
-            picked["completed"] = False
-            picked.pop("completed_at", None)
-            payload["completed"] = remain
-            payload["todos"] = [picked] + (payload.get("todos") or [])
-            cls._save(payload)
-            return picked
+            return cls._commit({"op": "reopen", "id": task_id})
+
+    @classmethod
+    def apply_batch(cls, items: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Apply create/complete/reopen/delete items under one lock with a single journal append.
+
+        Items are applied in order; a failed item is reported and skipped, not rolled back.
+        """
+        results: List[Dict[str, Any]] = []
+        with cls._lock:
+            index = cls._load()
+            now = cls._now_iso()
+            seq = cls._meta["journal_seq"]
+            applied: List[Dict[str, Any]] = []
+            for item in items:
+                kind = item.get("op")
+                task_id = item.get("id")
+                try:
+                    if kind == "create":
+                        op = {"op": "create", "task": cls._new_task(item.get("title"), item.get("list_name"), item.get("due_date"))}
+                    elif kind == "complete":
+                        op = {"op": "complete", "id": task_id, "completed_at": now}
+                    elif kind in ("reopen", "delete"):
+                        op = {"op": kind, "id": task_id}
+                    else:
+                        raise ValueError(f"不支持的操作: {kind}")
+                except ValueError as e:
+                    results.append({"op": kind, "id": task_id, "ok": False, "error": str(e)})
+                    continue
+
+                op["seq"] = seq + 1
+                op["at"] = now
+                task = cls._apply(index, op)
+                if task is None:
+                    missing = "历史任务不存在" if kind == "reopen" else "任务不存在"
+                    results.append({"op": kind, "id": task_id, "ok": False, "error": missing})
+                    continue
+                seq += 1
+                applied.append(op)
+                results.append({"op": kind, "id": task["id"], "ok": True, "data": task})
+
+            if applied:
+                cls._persist(applied)
+            return {"results": results, "applied": len(applied), "version": cls._meta["journal_seq"]}
+
+
+if TASK_STORE_BACKEND == "sql":
+    from services.sql_task_store import SqlTaskStore as TaskStore
+else:
+    TaskStore = FileTaskStore
@@ -1,21 +1,29 @@
 """Multi-provider usage aggregation service."""
-import json
 import time
+from concurrent.futures import Future, wait
 from datetime import datetime
+from threading import Lock
 from typing import Any, Dict, List, Optional, Tuple
 from urllib.error import HTTPError, URLError
 from urllib.parse import quote
-from urllib.request import Request, urlopen
 
-from config import MINIMAX_API_KEY, MINIMAX_GROUP_ID, MINIMAX_QUOTA_URL, MINIMAX_USAGE_IS_REMAINING
+from config import (
+    MINIMAX_API_KEY, MINIMAX_GROUP_ID, MINIMAX_QUOTA_URL, MINIMAX_USAGE_IS_REMAINING,
+    USAGE_FETCH_DEADLINE, USAGE_PROVIDER_TTLS, USAGE_DEFAULT_TTL, USAGE_ERROR_RETRY_TTL
+)
+from services.http_client import HttpClient
 from services.integration_store import IntegrationStore
+from services.worker_pools import WorkerPools
 
 
 class UsageService:
     """Build normalized usage panels for configured providers."""
 
-    _cache: Optional[Tuple[float, List[Dict[str, Any]]]] = None
-    _cache_ttl_seconds = 15
+    _fetch_lock = Lock()
+    _inflight: Dict[str, Future] = {}
+    # provider -> {"panel": last good panel, "error": last error panel, "checked_at", "stale_since"}
+    _entries: Dict[str, Dict[str, Any]] = {}
+    _generation = 0  # bumped on invalidate so in-flight fetches for old config are discarded
     _provider_order = ["minimax", "openai", "gemini", "glm"]
     _provider_titles = {
         "minimax": "MiniMax",
@@ -26,9 +34,7 @@ class UsageService:
 
     @classmethod
     def _request_json(cls, url: str, headers: Dict[str, str], timeout: int = 6) -> Dict[str, Any]:
-        req = Request(url, headers=headers)
-        with urlopen(req, timeout=timeout) as resp:
-            return json.loads(resp.read().decode("utf-8"))
+        return HttpClient.get_json(url, headers=headers, timeout=timeout)
 
     @classmethod
     def _effective_provider_cfg(cls, provider: str, cfg: Dict[str, Any]) -> Dict[str, Any]:
@@ -118,6 +124,114 @@ class UsageService:
             "notes": msg,
         }
 
+    @classmethod
+    def _pending_panel(cls, provider: str) -> Dict[str, Any]:
+        title = cls._provider_titles.get(provider, provider)
+        return {
+            "key": provider,
+            "title": title,
+            "type": "status",
+            "panel_state": "pending",
+            "source": "加载中",
+            "status": "pending",
+            "message": "数据加载中，稍后自动刷新",
+            "missing_fields": [],
+            "model": title,
+            "running_tasks": 0,
+            "running_agents": 0,
+            "metric_status": "加载中",
+            "used": None,
+            "total": None,
+            "percent": None,
+            "remaining_text": None,
+            "refresh_window": None,
+            "models": [],
+            "updated_at": datetime.utcnow().isoformat(),
+            "notes": None,
+        }
+
+    @classmethod
+    def _build_panel(cls, provider: str, cfg: Dict[str, Any], running_tasks: int, running_agents: int) -> Optional[Dict[str, Any]]:
+        if provider == "minimax":
+            return cls._build_minimax_panel(cfg)
+        if provider == "openai":
+            return cls._build_openai_panel(cfg)
+        if provider == "gemini":
+            return cls._build_gemini_panel(cfg, running_tasks, running_agents)
+        if provider == "glm":
+            return cls._build_glm_panel(cfg, running_tasks, running_agents)
+        return None
+
+    @classmethod
+    def _provider_ttl(cls, provider: str, cfg: Dict[str, Any]) -> float:
+        try:
+            override = cfg.get("cache_ttl_seconds")
+            if override not in (None, ""):
+                return max(float(override), 0.0)
+        except (TypeError, ValueError):
+            pass
+        return float(USAGE_PROVIDER_TTLS.get(provider, USAGE_DEFAULT_TTL))
+
+    @classmethod
+    def _entry_ttl(cls, provider: str, cfg: Dict[str, Any], entry: Dict[str, Any]) -> float:
+        """Full provider TTL once we have good data; a short retry while we only have an error."""
+        ttl = cls._provider_ttl(provider, cfg)
+        if entry["panel"] is None:
+            return min(ttl, float(USAGE_ERROR_RETRY_TTL))
+        return ttl
+
+    @classmethod
+    def _fetch_panel(cls, provider: str, cfg: Dict[str, Any], running_tasks: int, running_agents: int, generation: int) -> Optional[Dict[str, Any]]:
+        """Refresh one provider; failures keep the last good panel and mark it stale."""
+        try:
+            panel = cls._build_panel(provider, cfg, running_tasks, running_agents)
+            err_panel = None
+        except Exception as err:
+            source = "真实计数" if provider in {"minimax", "openai"} else "状态摘要"
+            panel = None
+            err_panel = cls._error_panel(provider, source, err, running_tasks, running_agents)
+
+        with cls._fetch_lock:
+            if generation != cls._generation:
+                return panel or err_panel
+            entry = cls._entries.setdefault(provider, {"panel": None, "error": None, "checked_at": 0.0, "stale_since": None})
+            entry["checked_at"] = time.time()
+            if err_panel is None:
+                if panel is None:
+                    return None
+                entry["panel"] = panel
+                entry["error"] = None
+                entry["stale_since"] = None
+            else:
+                entry["error"] = err_panel
+                if entry["panel"] is not None and not entry["stale_since"]:
+                    entry["stale_since"] = datetime.utcnow().isoformat()
+            return cls._serve(entry, running_tasks, running_agents)
+
+    @classmethod
+    def _serve(cls, entry: Dict[str, Any], running_tasks: int, running_agents: int) -> Dict[str, Any]:
+        """Copy of the panel to hand out; call with _fetch_lock held."""
+        if entry["panel"] is None:
+            return entry["error"]
+        panel = dict(entry["panel"])
+        if "running_tasks" in panel:
+            panel["running_tasks"] = running_tasks
+            panel["running_agents"] = running_agents
+        if entry["stale_since"]:
+            panel["stale"] = True
+            panel["stale_since"] = entry["stale_since"]
+        return panel
+
+    @classmethod
+    def _submit_fetch(cls, provider: str, cfg: Dict[str, Any], running_tasks: int, running_agents: int) -> Future:
+        """Start a provider refresh; concurrent callers share the one already running."""
+        with cls._fetch_lock:
+            future = cls._inflight.get(provider)
+            if future is None or future.done():
+                future = WorkerPools.submit("network", cls._fetch_panel, provider, cfg, running_tasks, running_agents, cls._generation)
+                cls._inflight[provider] = future
+            return future
+
     @classmethod
     def _build_minimax_panel(cls, cfg: Dict[str, Any]) -> Dict[str, Any]:
         api_key = str(cfg.get("api_key") or "").strip()
@@ -343,12 +457,10 @@ class UsageService:
 
     @classmethod
     def get_usage_panels(cls, running_tasks: int = 0, running_agents: int = 0) -> List[Dict[str, Any]]:
+        """Serve cached panels immediately and refresh expired providers in the background."""
         now = time.time()
-        if cls._cache and (now - cls._cache[0]) < cls._cache_ttl_seconds:
-            return cls._cache[1]
-
         cfg = IntegrationStore.get_all().get("providers", {})
-        panels: List[Dict[str, Any]] = []
+        slots: List[Tuple[str, Any]] = []
 
         for provider in cls._provider_order:
             raw_cfg = cfg.get(provider, {})
@@ -358,31 +470,51 @@ class UsageService:
             effective_cfg = cls._effective_provider_cfg(provider, raw_cfg)
             missing = cls._missing_required_fields(provider, effective_cfg)
             if missing:
-                panels.append(cls._empty_panel(provider, missing))
+                slots.append((provider, cls._empty_panel(provider, missing)))
                 continue
 
-            try:
-                if provider == "minimax":
-                    panel = cls._build_minimax_panel(effective_cfg)
-                elif provider == "openai":
-                    panel = cls._build_openai_panel(effective_cfg)
-                elif provider == "gemini":
-                    panel = cls._build_gemini_panel(effective_cfg, running_tasks, running_agents)
-                elif provider == "glm":
-                    panel = cls._build_glm_panel(effective_cfg, running_tasks, running_agents)
-                else:
-                    continue
-                panels.append(panel)
-            except Exception as err:
-                source = "真实计数" if provider in {"minimax", "openai"} else "状态摘要"
-                panels.append(cls._error_panel(provider, source, err, running_tasks, running_agents))
+            with cls._fetch_lock:
+                entry = cls._entries.get(provider)
+                served = cls._serve(entry, running_tasks, running_agents) if entry else None
+                expired = entry is None or (now - entry["checked_at"]) >= cls._entry_ttl(provider, effective_cfg, entry)
+
+            if served is not None:
+                # Stale-while-revalidate: answer now, refresh off the request path.
+                if expired:
+                    cls._submit_fetch(provider, effective_cfg, running_tasks, running_agents)
+                slots.append((provider, served))
+                continue
+
+            slots.append((provider, cls._submit_fetch(provider, effective_cfg, running_tasks, running_agents)))
 
-        cls._cache = (now, panels)
+        # Cold providers run concurrently; the request waits for the deadline, not the sum of timeouts.
+        futures = [slot for _, slot in slots if isinstance(slot, Future)]
+        if futures:
+            wait(futures, timeout=USAGE_FETCH_DEADLINE)
+
+        panels: List[Dict[str, Any]] = []
+        for provider, slot in slots:
+            if not isinstance(slot, Future):
+                panels.append(slot)
+            elif slot.done():
+                panel = slot.result()
+                if panel is not None:
+                    panels.append(panel)
+            else:
+                panels.append(cls._pending_panel(provider))
         return panels
 
+    @classmethod
+    def config_generation(cls) -> int:
+        """Bumped whenever provider config is saved; lets dependants notice config changes."""
+        return cls._generation
+
     @classmethod
     def invalidate_cache(cls):
-        cls._cache = None
+        with cls._fetch_lock:
+            cls._generation += 1
+            cls._inflight.clear()
+            cls._entries.clear()
 
     @classmethod
     def validate_provider(cls, provider: str, draft_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
@@ -415,15 +547,8 @@ class UsageService:
             return {"success": False, "message": f"配置不完整：缺少 {miss}"}
 
         try:
-            if provider == "minimax":
-                panel = cls._build_minimax_panel(effective_cfg)
-            elif provider == "openai":
-                panel = cls._build_openai_panel(effective_cfg)
-            elif provider == "gemini":
-                panel = cls._build_gemini_panel(effective_cfg, 0, 0)
-            elif provider == "glm":
-                panel = cls._build_glm_panel(effective_cfg, 0, 0)
-            else:
+            panel = cls._build_panel(provider, effective_cfg, 0, 0)
+            if panel is None:
                 return {"success": False, "message": "不支持的 provider"}
 
             return {"success": True, "message": "草稿验证成功（尚未保存）", "panel": panel}
@@ -0,0 +1,96 @@
+"""
+Worker pools - sized thread pools per workload class for blocking collector/executor work
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+from config import WORKER_POOL_SIZES
+
+
+class InstrumentedPool:
+    """ThreadPoolExecutor wrapper that tracks queue depth and queue wait time"""
+
+    def __init__(self, name: str, size: int):
+        self.name = name
+        self.size = size
+        self._executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix=f"{name}-pool")
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._active = 0
+        self._completed = 0
+        self._failed = 0
+        self._wait_ms_total = 0.0
+        self._wait_ms_max = 0.0
+        self._last_wait_ms = 0.0
+
+    def submit(self, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        enqueued = time.perf_counter()
+        with self._lock:
+            self._queued += 1
+
+        def run():
+            waited = (time.perf_counter() - enqueued) * 1000
+            with self._lock:
+                self._queued -= 1
+                self._active += 1
+                self._wait_ms_total += waited
+                self._wait_ms_max = max(self._wait_ms_max, waited)
+                self._last_wait_ms = waited
+            ok = False
+            try:
+                result = fn(*args, **kwargs)
+                ok = True
+                return result
+            finally:
+                with self._lock:
+                    self._active -= 1
+                    self._completed += 1
+                    self._failed += int(not ok)
+
+        return self._executor.submit(run)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            started = self._completed + self._active
+            return {
+                "size": self.size,
+                "queued": self._queued,
+                "active": self._active,
+                "completed": self._completed,
+                "failed": self._failed,
+                "avg_wait_ms": round(self._wait_ms_total / started, 3) if started else 0.0,
+                "max_wait_ms": round(self._wait_ms_max, 3),
+                "last_wait_ms": round(self._last_wait_ms, 3),
+            }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class WorkerPools:
+    """Named pools: ``subprocess`` (CLI calls), ``file_io`` (config/log/task reads), ``network`` (provider HTTP), ``db`` (chat history)"""
+    _pools: Dict[str, InstrumentedPool] = {
+        name: InstrumentedPool(name, size) for name, size in WORKER_POOL_SIZES.items()
+    }
+
+    @classmethod
+    def submit(cls, pool: str, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        """Queue blocking work on a pool from synchronous code."""
+        return cls._pools[pool].submit(fn, *args, **kwargs)
+
+    @classmethod
+    async def run(cls, pool: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Await blocking work without holding up the event loop."""
+        return await asyncio.wrap_future(cls.submit(pool, fn, *args, **kwargs))
+
+    @classmethod
+    def stats(cls) -> Dict[str, Dict[str, Any]]:
+        return {name: pool.stats() for name, pool in cls._pools.items()}
+
+    @classmethod
+    def shutdown(cls):
+        for pool in cls._pools.values():
+            pool.shutdown()